@@ -0,0 +1,96 @@
+import hashlib
+import json
+import os
+
+
+PACKAGE = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_DIRECTORY = os.path.join(os.path.dirname(PACKAGE), ".cache", "results")
+DEFAULT_MAX_BYTES = 16 * 1024 * 1024
+CHUNK_SIZE = 1024 * 1024
+
+
+def file_digest(path: os.PathLike) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        while chunk := f.read(CHUNK_SIZE):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def source_digest(path: os.PathLike) -> str:
+    """
+    Hashes a solver together with the shared aoc modules it can import, so
+    that editing either invalidates its entries.
+    """
+    digest = hashlib.sha256()
+    sources = [path] + [
+        os.path.join(PACKAGE, name)
+        for name in sorted(os.listdir(PACKAGE))
+        if name.endswith(".py")
+    ]
+    for source in sources:
+        with open(source, "rb") as f:
+            digest.update(f.read())
+    return digest.hexdigest()
+
+
+class ResultCache:
+    """
+    Stores one small JSON file per (input, solver source) key. Reading an
+    entry refreshes its modification time, which is what eviction uses to
+    drop the least recently used entries once the directory grows past
+    max_bytes.
+    """
+
+    def __init__(
+        self,
+        directory: os.PathLike = DEFAULT_DIRECTORY,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+    ) -> None:
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self._input_digests: dict[str, str] = {}
+
+    def key(self, solver_path: os.PathLike, input_path: os.PathLike) -> str:
+        input_path = os.path.abspath(input_path)
+        if input_path not in self._input_digests:
+            self._input_digests[input_path] = file_digest(input_path)
+        combined = f"{self._input_digests[input_path]}:{source_digest(solver_path)}"
+        return hashlib.sha256(combined.encode("ascii")).hexdigest()
+
+    def _entry_path(self, key: str) -> str:
+        return os.path.join(self.directory, f"{key}.json")
+
+    def get(self, key: str) -> dict | None:
+        path = self._entry_path(key)
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return None
+        os.utime(path)
+        return entry
+
+    def put(self, key: str, entry: dict) -> None:
+        os.makedirs(self.directory, exist_ok=True)
+        path = self._entry_path(key)
+        partial = f"{path}.{os.getpid()}.tmp"
+        with open(partial, "w", encoding="utf-8") as f:
+            json.dump(entry, f)
+        os.replace(partial, path)
+        self.evict()
+
+    def evict(self) -> None:
+        entries: list[tuple[float, int, str]] = []
+        for name in os.listdir(self.directory):
+            if not name.endswith(".json"):
+                continue
+            path = os.path.join(self.directory, name)
+            stat = os.stat(path)
+            entries.append((stat.st_mtime, stat.st_size, path))
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            os.remove(path)
+            total -= size
@@ -0,0 +1,122 @@
+import importlib.util
+import os
+from concurrent.futures import ProcessPoolExecutor
+from types import ModuleType
+from typing import Callable, Iterable, Iterator, TypeVar
+
+from aoc.verbosity import tracing
+
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+MIN_CHUNK_BYTES = 64 * 1024
+CHUNKS_PER_WORKER = 4
+
+_workers = int(os.environ.get("AOC_WORKERS", "1"))
+_solvers: dict[str, ModuleType] = {}
+
+
+def set_workers(count: int) -> None:
+    """
+    Sets how many processes map_chunks spreads a file over, 0 for one per CPU.
+    """
+    global _workers
+    _workers = count
+
+
+def get_workers() -> int:
+    return _workers or os.cpu_count() or 1
+
+
+def chunk_ranges(path: os.PathLike, count: int) -> list[tuple[int, int]]:
+    """
+    Splits a file into at most count byte ranges of about the same size, each
+    moved forward to end just after a newline so no line is cut in two.
+    """
+    size = os.path.getsize(path)
+    boundaries = [0]
+    with open(path, "rb") as f:
+        for k in range(1, count):
+            target = size * k // count
+            if target <= boundaries[-1]:
+                continue
+            f.seek(target - 1)
+            f.readline()
+            position = f.tell()
+            if boundaries[-1] < position < size:
+                boundaries.append(position)
+    boundaries.append(size)
+    return list(zip(boundaries[:-1], boundaries[1:]))
+
+
+def read_range(path: os.PathLike, start: int, end: int) -> Iterator[str]:
+    """
+    Like read_lines, restricted to the lines in the byte range [start, end).
+    """
+    with open(path, "rb") as f:
+        f.seek(start)
+        position = start
+        while position < end:
+            line = f.readline()
+            if not line:
+                return
+            position += len(line)
+            yield line.decode("utf-8").strip()
+
+
+def _load_solver(source: str) -> ModuleType:
+    """
+    Imports a solver script by path in a worker, once per worker. Solvers
+    run by the runner or as __main__ are not importable by module name
+    there, which spawned and forkserver workers would need to unpickle a
+    function reference.
+    """
+    if source not in _solvers:
+        name = f"_chunks_solver_{len(_solvers)}"
+        spec = importlib.util.spec_from_file_location(name, source)
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+        _solvers[source] = module
+    return _solvers[source]
+
+
+def _map_range(source: str, name: str, path: os.PathLike, start: int, end: int):
+    mapper = getattr(_load_solver(source), name)
+    return mapper(read_range(path, start, end))
+
+
+def map_chunks(
+    path: os.PathLike,
+    mapper: Callable[[Iterable[str]], T],
+    reducer: Callable[[list[T]], R],
+) -> R:
+    """
+    Runs mapper over the lines of each chunk of the file in worker processes
+    and combines their partial results, in file order, with reducer.
+
+    mapper must be a module level function of the solver script, which each
+    worker imports again by path to look it up by name. Small files, a
+    single worker, or tracing, which needs the diagnostics in order, run
+    everything in this process as one chunk.
+    """
+    size = os.path.getsize(path)
+    workers = get_workers()
+    count = min(workers * CHUNKS_PER_WORKER, size // MIN_CHUNK_BYTES)
+    if workers == 1 or count <= 1 or tracing():
+        return reducer([mapper(read_range(path, 0, size))])
+    ranges = chunk_ranges(path, count)
+    with ProcessPoolExecutor(max_workers=min(workers, len(ranges))) as executor:
+        source = mapper.__code__.co_filename
+        futures = [
+            executor.submit(_map_range, source, mapper.__name__, path, start, end)
+            for start, end in ranges
+        ]
+        return reducer([future.result() for future in futures])
+
+
+def concatenate(partials: list[list[T]]) -> list[T]:
+    """
+    Reducer for mappers that return a list of records per chunk.
+    """
+    return [item for partial in partials for item in partial]
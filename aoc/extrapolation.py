@@ -0,0 +1,35 @@
+class Extrapolator:
+    """
+    Predicts a sequence that arrives one value at a time, keeping only the
+    first and last value of each level of differences. Appending updates
+    every level in one pass, and the predictions are sums over the levels.
+
+    Only degree levels of differences above the values are kept, so memory
+    and the cost of an append are bounded by the degree rather than the
+    history. The predictions are exact for histories that are polynomials
+    of at most that degree.
+    """
+
+    def __init__(self, degree: int) -> None:
+        if degree < 0:
+            raise ValueError(f"Degree must not be negative, got {degree}")
+        self.levels = degree + 1
+        self.heads: list[int] = []
+        self.tails: list[int] = []
+
+    def append(self, value: int) -> None:
+        difference = value
+        for level, last in enumerate(self.tails):
+            self.tails[level] = difference
+            difference -= last
+        if len(self.tails) < self.levels:
+            self.heads.append(difference)
+            self.tails.append(difference)
+
+    @property
+    def next(self) -> int:
+        return sum(self.tails)
+
+    @property
+    def previous(self) -> int:
+        return sum(self.heads[0::2]) - sum(self.heads[1::2])
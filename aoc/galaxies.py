@@ -0,0 +1,97 @@
+import os
+from array import array
+from dataclasses import dataclass
+from typing import Iterable, Self
+
+from aoc.grid import Grid
+
+
+GALAXY = ord("#")
+
+
+@dataclass
+class Position:
+    x: int
+    y: int
+
+
+def expanded_offsets(counts: array, expansion: int) -> array:
+    """
+    Maps each coordinate to where it ends up once every empty row or column
+    before it has grown to expansion times its size, using a running count
+    of the empty ones instead of shifting galaxies once per empty line.
+    """
+    offsets = array("q", [0]) * len(counts)
+    empty = 0
+    for i, count in enumerate(counts):
+        offsets[i] = i + empty * (expansion - 1)
+        if count == 0:
+            empty += 1
+    return offsets
+
+
+def axis_terms(counts: array) -> tuple[int, int]:
+    """
+    Splits the distance along one axis over every pair of galaxies into the
+    unexpanded sum and the number of times a pair crosses an empty line.
+
+    Walking the coordinates in order visits the galaxies already sorted, and
+    each one is that far from all n galaxies before it minus their prefix
+    sum, so no pair is ever built. An empty line is crossed by every pair
+    with one galaxy on either side of it.
+    """
+    total = sum(counts)
+    base = 0
+    crossings = 0
+    seen = 0
+    prefix = 0
+    for position, count in enumerate(counts):
+        if count == 0:
+            crossings += seen * (total - seen)
+            continue
+        base += count * (seen * position - prefix)
+        seen += count
+        prefix += count * position
+    return base, crossings
+
+
+@dataclass
+class DistanceTerms:
+    """
+    The total distance is linear in the expansion factor, so after one pass
+    over the galaxies any factor is answered in constant time.
+    """
+
+    base: int
+    crossings: int
+
+    @classmethod
+    def from_counts(cls, column_counts: array, row_counts: array) -> Self:
+        column_base, column_crossings = axis_terms(column_counts)
+        row_base, row_crossings = axis_terms(row_counts)
+        return cls(column_base + row_base, column_crossings + row_crossings)
+
+    def total(self, expansion: int) -> int:
+        return self.base + (expansion - 1) * self.crossings
+
+    def sweep(self, expansions: Iterable[int]) -> list[int]:
+        return [self.total(expansion) for expansion in expansions]
+
+
+def count_galaxies(grid: Grid) -> tuple[array, array, list[Position]]:
+    column_counts = array("q", [0]) * grid.width
+    row_counts = array("q", [0]) * grid.height
+    galaxies: list[Position] = []
+    for x, y in grid.find_all(GALAXY):
+        column_counts[x] += 1
+        row_counts[y] += 1
+        galaxies.append(Position(x, y))
+    return column_counts, row_counts, galaxies
+
+
+def sweep(path: os.PathLike, expansions: Iterable[int]) -> list[int]:
+    """
+    Total distances for each expansion factor, reading the map only once.
+    """
+    column_counts, row_counts, _ = count_galaxies(Grid.read(path))
+    return DistanceTerms.from_counts(column_counts, row_counts).sweep(expansions)
@@ -0,0 +1,155 @@
+import os
+from typing import Iterable, Iterator, Self
+
+from aoc.inputs import read_lines
+
+ORTHOGONAL = ((0, -1), (1, 0), (0, 1), (-1, 0))
+DIAGONAL = ((1, -1), (1, 1), (-1, 1), (-1, -1))
+
+
+class Grid:
+    """
+    A rectangular grid of single byte cells stored row by row in one
+    bytearray. Cells are addressed as (x, y) from the top left and hold the
+    byte value, so compare them against ord("#") or b"#"[0].
+    """
+
+    def __init__(self, data: bytearray, width: int, height: int) -> None:
+        if len(data) != width * height:
+            raise ValueError(f"{len(data)} bytes do not make a {width}x{height} grid")
+        self.data = data
+        self.width = width
+        self.height = height
+        self._transposed: Self | None = None
+
+    @classmethod
+    def from_lines(cls, lines: Iterable[str | bytes]) -> Self:
+        data = bytearray()
+        width = 0
+        height = 0
+        for line in lines:
+            if isinstance(line, str):
+                line = line.encode("ascii")
+            if height == 0:
+                width = len(line)
+            elif len(line) != width:
+                raise ValueError(f"Row {height} is {len(line)} wide, expected {width}")
+            data += line
+            height += 1
+        return cls(data, width, height)
+
+    @classmethod
+    def read(cls, path: os.PathLike) -> Self:
+        """
+        Reads the grid at the start of a file, up to the first blank line.
+        """
+        lines: list[str] = []
+        for line in read_lines(path):
+            if not line:
+                break
+            lines.append(line)
+        return cls.from_lines(lines)
+
+    def __repr__(self) -> str:
+        return f"<grid {self.width}x{self.height}>"
+
+    def __str__(self) -> str:
+        return "\n".join(self.row_bytes(y).decode("ascii") for y in range(self.height))
+
+    def index(self, x: int, y: int) -> int:
+        return y * self.width + x
+
+    def position(self, index: int) -> tuple[int, int]:
+        y, x = divmod(index, self.width)
+        return x, y
+
+    def in_bounds(self, x: int, y: int) -> bool:
+        return 0 <= x < self.width and 0 <= y < self.height
+
+    def __getitem__(self, position: tuple[int, int]) -> int:
+        x, y = position
+        return self.data[y * self.width + x]
+
+    def __setitem__(self, position: tuple[int, int], value: int) -> None:
+        x, y = position
+        self.data[y * self.width + x] = value
+        self._transposed = None
+
+    def get(self, x: int, y: int, default: int | None = None) -> int | None:
+        if not self.in_bounds(x, y):
+            return default
+        return self.data[y * self.width + x]
+
+    def neighbours(
+        self, x: int, y: int, *, diagonal: bool = False
+    ) -> Iterator[tuple[int, int]]:
+        offsets = ORTHOGONAL + DIAGONAL if diagonal else ORTHOGONAL
+        for dx, dy in offsets:
+            nx = x + dx
+            ny = y + dy
+            if 0 <= nx < self.width and 0 <= ny < self.height:
+                yield nx, ny
+
+    def row(self, y: int) -> memoryview:
+        """
+        A zero-copy view of the row, which stays in sync with the grid.
+        Writing through it bypasses the transpose() cache.
+        """
+        start = y * self.width
+        return memoryview(self.data)[start : start + self.width]
+
+    def row_bytes(self, y: int) -> bytes:
+        start = y * self.width
+        return bytes(self.data[start : start + self.width])
+
+    def rows(self) -> Iterator[memoryview]:
+        if self.width == 0:
+            return
+        view = memoryview(self.data)
+        for start in range(0, len(self.data), self.width):
+            yield view[start : start + self.width]
+
+    def set_row(self, y: int, values: bytes) -> None:
+        start = y * self.width
+        self.data[start : start + self.width] = values
+        self._transposed = None
+
+    def column(self, x: int) -> bytes:
+        return bytes(self.data[x :: self.width])
+
+    def set_column(self, x: int, values: bytes) -> None:
+        self.data[x :: self.width] = values
+        self._transposed = None
+
+    def transpose(self) -> Self:
+        """
+        The grid flipped along its diagonal, built once and reused until the
+        grid is next modified through __setitem__, set_row or set_column.
+        Writes through row() views or straight into data do not invalidate
+        it, so make them before transposing or use those methods instead.
+        """
+        if self._transposed is None:
+            data = bytearray().join(self.column(x) for x in range(self.width))
+            self._transposed = Grid(data, self.height, self.width)
+        return self._transposed
+
+    def padded(self, fill: int) -> Self:
+        """
+        A copy with a one cell border of fill around it, so that stepping off
+        the original grid by one cell lands on fill instead of wrapping.
+        """
+        width = self.width + 2
+        border = bytes((fill,)) * width
+        side = bytes((fill,))
+        data = bytearray(border)
+        for y in range(self.height):
+            data += side + self.row_bytes(y) + side
+        data += border
+        return Grid(data, width, self.height + 2)
+
+    def find_all(self, value: int) -> Iterator[tuple[int, int]]:
+        target = bytes((value,))
+        index = self.data.find(target)
+        while index != -1:
+            yield self.position(index)
+            index = self.data.find(target, index + 1)
@@ -0,0 +1,143 @@
+import itertools
+import mmap
+import os
+from array import array
+from typing import Iterable
+
+
+PACKAGE = os.path.dirname(os.path.abspath(__file__))
+TABLE_DIRECTORY = os.path.join(os.path.dirname(PACKAGE), ".cache", "hands")
+
+CARDS = "23456789TJQKA"
+JOKER_CARDS = "J23456789TQKA"
+HAND_TYPES = [
+    "High Card",
+    "One Pair",
+    "Two Pair",
+    "Three of a Kind",
+    "Full House",
+    "Four of a Kind",
+    "Five of a Kind",
+]
+
+CARD_BITS = 4
+HAND_SIZE = 5
+TYPE_SHIFT = CARD_BITS * HAND_SIZE
+BID_BITS = 32
+BID_MASK = (1 << BID_BITS) - 1
+TABLE_SIZE = len(CARDS) ** HAND_SIZE
+# Bump when hand_type changes so stale tables on disk are rebuilt
+TABLE_VERSION = 1
+
+_tables: dict[bool, bytes | mmap.mmap] = {}
+
+
+def hand_type(hand: str, *, jokers: bool = False) -> int:
+    """
+    The index into HAND_TYPES of a hand, with jokers joining whichever card
+    there is most of when they are wild.
+    """
+    wild = 0
+    if jokers:
+        wild = hand.count("J")
+        hand = hand.replace("J", "")
+    counts = sorted(map(hand.count, set(hand)), reverse=True) + [0, 0]
+    most = counts[0] + wild
+    if most >= 4:
+        return most + 1
+    if most == 3:
+        return 4 if counts[1] == 2 else 3
+    if most == 2:
+        return 2 if counts[1] == 2 else 1
+    return 0
+
+
+def build_table(*, jokers: bool = False) -> bytes:
+    """
+    The type of every possible hand, one byte each, at the hand's cards read
+    as a base 13 number of their strengths.
+    """
+    cards = JOKER_CARDS if jokers else CARDS
+    return bytes(
+        hand_type("".join(hand), jokers=jokers)
+        for hand in itertools.product(cards, repeat=HAND_SIZE)
+    )
+
+
+def load_table(*, jokers: bool = False) -> bytes | mmap.mmap:
+    """
+    The build_table lookup for a rule set, built on first use and kept in
+    the cache directory, then memory mapped by every later process. Falls
+    back to the table in memory when the directory cannot be written.
+    """
+    if jokers in _tables:
+        return _tables[jokers]
+    rules = "jokers" if jokers else "standard"
+    path = os.path.join(TABLE_DIRECTORY, f"{rules}-v{TABLE_VERSION}.bin")
+    if not os.path.exists(path) or os.path.getsize(path) != TABLE_SIZE:
+        table = build_table(jokers=jokers)
+        try:
+            os.makedirs(TABLE_DIRECTORY, exist_ok=True)
+            partial = f"{path}.{os.getpid()}.tmp"
+            with open(partial, "wb") as f:
+                f.write(table)
+            os.replace(partial, path)
+        except OSError:
+            _tables[jokers] = table
+            return table
+    with open(path, "rb") as f:
+        _tables[jokers] = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    return _tables[jokers]
+
+
+def encode_hand(hand: str, *, jokers: bool = False) -> int:
+    """
+    Packs a hand into an int that sorts the same way the hands rank: the
+    type in the top bits, then each card's strength in 4 bits, first card
+    most significant. The type is a single lookup in the load_table table.
+    """
+    cards = JOKER_CARDS if jokers else CARDS
+    table = load_table(jokers=jokers)
+    key = 0
+    index = 0
+    for card in hand:
+        strength = cards.index(card)
+        key = key << CARD_BITS | strength
+        index = index * len(cards) + strength
+    return table[index] << TYPE_SHIFT | key
+
+
+def decode_hand(key: int, *, jokers: bool = False) -> tuple[str, int]:
+    """
+    The hand and its type back from an encode_hand key.
+    """
+    cards = JOKER_CARDS if jokers else CARDS
+    hand = "".join(
+        cards[key >> (CARD_BITS * i) & ((1 << CARD_BITS) - 1)]
+        for i in reversed(range(HAND_SIZE))
+    )
+    return hand, key >> TYPE_SHIFT
+
+
+def read_records(lines: Iterable[str], *, jokers: bool = False) -> array:
+    """
+    Reads "hand bid" lines into one int per player, the hand's key above
+    the bid, so sorting the plain ints ranks the players.
+    """
+    records = array("q")
+    for line in lines:
+        if not line:
+            continue
+        hand, bid = line.split(" ", 1)
+        bid = int(bid)
+        if not 0 <= bid <= BID_MASK:
+            raise ValueError(f"Bid {bid} does not fit in {BID_BITS} bits")
+        records.append(encode_hand(hand, jokers=jokers) << BID_BITS | bid)
+    return records
+
+
+def concatenate_records(partials: list[array]) -> array:
+    records = array("q")
+    for partial in partials:
+        records.extend(partial)
+    return records
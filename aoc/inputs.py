@@ -0,0 +1,49 @@
+import os
+from typing import Iterator
+
+
+CHUNK_SIZE = 1024 * 1024
+
+
+def read_lines(path: os.PathLike, *, keepends: bool = False) -> Iterator[str]:
+    """
+    Lazily yields the lines of a file, stripped of surrounding whitespace
+    unless keepends is set. Only one line is held in memory at a time.
+    """
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            yield line if keepends else line.strip()
+
+
+def read_blocks(path: os.PathLike) -> Iterator[list[str]]:
+    """
+    Lazily yields each run of non-blank lines, as separated by blank lines.
+    """
+    block: list[str] = []
+    for line in read_lines(path):
+        if line:
+            block.append(line)
+            continue
+        if block:
+            yield block
+            block = []
+    if block:
+        yield block
+
+
+def read_tokens(
+    path: os.PathLike, separator: bytes, *, chunk_size: int = CHUNK_SIZE
+) -> Iterator[bytes]:
+    """
+    Streams the pieces of a file between separators, reading it chunk_size
+    bytes at a time. A piece cut off at the end of a chunk is carried over
+    and completed by the next one, so memory stays bounded by the chunk size
+    and the longest piece however large the file is.
+    """
+    with open(path, "rb") as f:
+        pending = b""
+        while chunk := f.read(chunk_size):
+            pieces = (pending + chunk).split(separator)
+            pending = pieces.pop()
+            yield from pieces
+        yield pending
@@ -0,0 +1,44 @@
+import re
+from array import array
+
+_DIGITS = b"0123456789"
+_KEEP_DIGITS = bytes(c if c in _DIGITS else 0x20 for c in range(256))
+_KEEP_SIGNED = bytes(c if c in _DIGITS or c == 0x2D else 0x20 for c in range(256))
+
+integer_pattern = re.compile(rb"[0-9]+")
+signed_integer_pattern = re.compile(rb"-?[0-9]+")
+
+
+def extract_ints(text: str | bytes, *, signed: bool = True) -> list[int]:
+    """
+    Pulls every integer out of a line or a whole buffer in one pass.
+
+    Everything that cannot be part of a number is translated to a space and
+    the rest is split, which is much faster than a regex. Stray dashes, like
+    in "seed-to-soil", make that fail and fall back to the regex instead.
+    """
+    if isinstance(text, str):
+        text = text.encode("ascii")
+    table = _KEEP_SIGNED if signed else _KEEP_DIGITS
+    try:
+        return list(map(int, text.translate(table).split()))
+    except ValueError:
+        pattern = signed_integer_pattern if signed else integer_pattern
+        return list(map(int, pattern.findall(text)))
+
+
+def extract_int_array(
+    text: str | bytes, *, signed: bool = True, numpy: bool = False
+) -> array:
+    """
+    Bulk variant of extract_ints returning a compact array('q'), or a NumPy
+    int64 array when numpy is set. Values must fit in 64 bits.
+    """
+    values = extract_ints(text, signed=signed)
+    if numpy:
+        try:
+            import numpy as np
+        except ImportError as e:
+            raise ImportError("numpy=True requires NumPy to be installed") from e
+        return np.array(values, dtype=np.int64)
+    return array("q", values)
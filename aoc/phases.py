@@ -0,0 +1,50 @@
+import time
+from contextlib import contextmanager
+from typing import Iterator
+
+
+PARSE = "parse"
+SOLVE = "solve"
+RENDER = "render"
+
+_timings: dict[str, float] = {}
+_stack: list[str] = []
+_resumed: float = 0.0
+
+
+def _charge(now: float) -> None:
+    if _stack:
+        _timings[_stack[-1]] = _timings.get(_stack[-1], 0.0) + now - _resumed
+
+
+@contextmanager
+def phase(name: str) -> Iterator[None]:
+    """
+    Times the enclosed block under name. Phases nest exclusively: while an
+    inner phase runs the outer one is paused, so a render inside a solve is
+    not also counted as solving.
+
+    These are meant to wrap whole stages of run(). Single pass solvers that
+    parse and solve each line together mark the loop as solve.
+    """
+    global _resumed
+    now = time.perf_counter()
+    _charge(now)
+    _stack.append(name)
+    _resumed = now
+    try:
+        yield
+    finally:
+        now = time.perf_counter()
+        _charge(now)
+        _stack.pop()
+        _resumed = now
+
+
+def reset_phases() -> None:
+    _timings.clear()
+    _stack.clear()
+
+
+def phase_timings() -> dict[str, float]:
+    return dict(_timings)
@@ -0,0 +1,295 @@
+import argparse
+import contextlib
+import cProfile
+import importlib.util
+import io
+import json
+import os
+import pstats
+import re
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import asdict, dataclass, field
+from types import ModuleType
+from typing import Iterator
+
+from aoc.cache import DEFAULT_MAX_BYTES, ResultCache
+from aoc.chunks import set_workers
+from aoc.phases import PARSE, RENDER, SOLVE, phase_timings, reset_phases
+from aoc.verbosity import Verbosity, parse_verbosity, set_verbosity
+
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PROFILE_LIMIT = 25
+
+day_pattern = re.compile(r"day([0-9]+)$")
+part_pattern = re.compile(r"part([0-9]+)\.py$")
+
+
+@dataclass
+class Solver:
+    day: int
+    part: int
+    path: str
+
+    def __repr__(self) -> str:
+        return f"Day {self.day:02} Part {self.part}"
+
+    @property
+    def module_name(self) -> str:
+        return f"day{self.day:02}_part{self.part}"
+
+    def input_path(self, input_name: str) -> str:
+        return os.path.join(os.path.dirname(self.path), input_name)
+
+    def load(self) -> ModuleType:
+        if self.module_name in sys.modules:
+            return sys.modules[self.module_name]
+        spec = importlib.util.spec_from_file_location(self.module_name, self.path)
+        module = importlib.util.module_from_spec(spec)
+        sys.modules[self.module_name] = module
+        spec.loader.exec_module(module)
+        return module
+
+
+@dataclass
+class Result:
+    day: int
+    part: int
+    answer: str | None
+    seconds: float
+    error: str | None = None
+    cached: bool = False
+    phases: dict[str, float] = field(default_factory=dict)
+
+
+def discover(root: os.PathLike = ROOT, days: list[int] | None = None) -> list[Solver]:
+    solvers: list[Solver] = []
+    for day_dir in sorted(os.listdir(root)):
+        day_match = day_pattern.match(day_dir)
+        if day_match is None:
+            continue
+        day = int(day_match.group(1))
+        if days and day not in days:
+            continue
+        for filename in sorted(os.listdir(os.path.join(root, day_dir))):
+            part_match = part_pattern.match(filename)
+            if part_match is None:
+                continue
+            solvers.append(
+                Solver(
+                    day,
+                    int(part_match.group(1)),
+                    os.path.join(root, day_dir, filename),
+                )
+            )
+    return solvers
+
+
+def run_solver(
+    solver: Solver,
+    input_name: str = "input.txt",
+    verbosity: Verbosity = Verbosity.QUIET,
+    profile: str | None = None,
+    workers: int = 1,
+) -> Result:
+    """
+    Runs one solver and times it. With profile set to a pstats sort key the
+    solver also runs under cProfile and its top functions go to stderr.
+    workers is how many processes solvers built on map_chunks may use.
+    """
+    answer: str | None = None
+    error: str | None = None
+    profiler = cProfile.Profile() if profile else None
+    set_verbosity(verbosity)
+    set_workers(workers)
+    reset_phases()
+    with open(os.devnull, "w", encoding="utf-8") as devnull:
+        # Solver output goes to stderr so that it never mixes with the table
+        output = devnull if verbosity == Verbosity.QUIET else sys.stderr
+        start = time.perf_counter()
+        try:
+            with contextlib.redirect_stdout(output):
+                module = solver.load()
+                if not hasattr(module, "run"):
+                    raise RuntimeError(f"{solver} does not provide run()")
+                start = time.perf_counter()
+                if profiler is not None:
+                    profiler.enable()
+                try:
+                    answer = module.run(solver.input_path(input_name))
+                finally:
+                    if profiler is not None:
+                        profiler.disable()
+        except Exception as e:
+            error = f"{type(e).__name__}: {e}"
+        seconds = time.perf_counter() - start
+    if profiler is not None:
+        stats = io.StringIO()
+        pstats.Stats(profiler, stream=stats).sort_stats(profile).print_stats(
+            PROFILE_LIMIT
+        )
+        print(f"===== {solver} =====", stats.getvalue(), sep="\n", file=sys.stderr)
+    return Result(
+        solver.day, solver.part, answer, seconds, error, phases=phase_timings()
+    )
+
+
+def run_solvers(
+    solvers: list[Solver],
+    input_name: str = "input.txt",
+    verbosity: Verbosity = Verbosity.QUIET,
+    jobs: int = 1,
+    profile: str | None = None,
+    workers: int = 1,
+) -> Iterator[Result]:
+    """
+    Yields results in the order the solvers finish. With more than one job
+    each solver runs in its own worker process, so a full pass takes about as
+    long as the slowest solver.
+    """
+    if jobs == 1:
+        for solver in solvers:
+            yield run_solver(solver, input_name, verbosity, profile, workers)
+        return
+    with ProcessPoolExecutor(max_workers=jobs or None) as executor:
+        futures = [
+            executor.submit(
+                run_solver, solver, input_name, verbosity, profile, workers
+            )
+            for solver in solvers
+        ]
+        for future in as_completed(futures):
+            yield future.result()
+
+
+def run_cached(
+    solvers: list[Solver],
+    cache: ResultCache,
+    input_name: str = "input.txt",
+    verbosity: Verbosity = Verbosity.QUIET,
+    jobs: int = 1,
+    workers: int = 1,
+) -> Iterator[Result]:
+    """
+    Answers solvers whose source and input are unchanged from the cache,
+    along with the time they originally took, and runs the rest. Cached
+    answers are only used when quiet since they produce no diagnostics.
+    """
+    keys: dict[tuple[int, int], str] = {}
+    pending: list[Solver] = []
+    for solver in solvers:
+        key = cache.key(solver.path, solver.input_path(input_name))
+        entry = cache.get(key) if verbosity == Verbosity.QUIET else None
+        if entry is None:
+            keys[solver.day, solver.part] = key
+            pending.append(solver)
+            continue
+        yield Result(**entry, cached=True)
+    for result in run_solvers(pending, input_name, verbosity, jobs, workers=workers):
+        if result.error is None:
+            entry = asdict(result)
+            del entry["cached"]
+            cache.put(keys[result.day, result.part], entry)
+        yield result
+
+
+def write_table(results: list[Result], output_format: str) -> None:
+    if output_format == "json":
+        json.dump([asdict(r) for r in results], sys.stdout, indent=2)
+        print()
+        return
+    names = (PARSE, SOLVE, RENDER)
+    print("day\tpart\tanswer\tseconds", *names, sep="\t")
+    for r in results:
+        answer = r.answer if r.error is None else f"!{r.error}"
+        phases = [f"{r.phases.get(name, 0.0):.6f}" for name in names]
+        print(f"{r.day}\t{r.part}\t{answer}\t{r.seconds:.6f}", *phases, sep="\t")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(
+        description="Run every dayNN/partN.py solver and tabulate the answers."
+    )
+    parser.add_argument(
+        "days", metavar="DAY", type=int, nargs="*", help="only run these days"
+    )
+    parser.add_argument(
+        "--input",
+        default="input.txt",
+        help="input file name inside each day directory (default: input.txt)",
+    )
+    parser.add_argument(
+        "--format", choices=("tsv", "json"), default="tsv", help="output format"
+    )
+    parser.add_argument(
+        "--verbosity",
+        choices=[v.name.lower() for v in Verbosity],
+        default="quiet",
+        help="solver diagnostics, written to stderr (default: quiet)",
+    )
+    parser.add_argument(
+        "--jobs",
+        "-j",
+        type=int,
+        default=1,
+        help="worker processes to spread solvers over, 0 for one per CPU",
+    )
+    parser.add_argument(
+        "--workers",
+        "-w",
+        type=int,
+        default=1,
+        help="processes each line by line solver may split its input over,"
+        " 0 for one per CPU",
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="run every solver instead of reusing answers for unchanged inputs",
+    )
+    parser.add_argument(
+        "--cache-size",
+        type=int,
+        default=DEFAULT_MAX_BYTES,
+        help="bytes of cached answers to keep before evicting the oldest",
+    )
+    parser.add_argument(
+        "--profile",
+        nargs="?",
+        const="cumulative",
+        metavar="SORT",
+        help="run under cProfile and print stats sorted by SORT (default: cumulative)",
+    )
+    args = parser.parse_args()
+    verbosity = parse_verbosity(args.verbosity)
+
+    solvers = [
+        s for s in discover(days=args.days) if os.path.exists(s.input_path(args.input))
+    ]
+    start = time.perf_counter()
+    if args.no_cache or args.profile:
+        results = list(
+            run_solvers(
+                solvers, args.input, verbosity, args.jobs, args.profile, args.workers
+            )
+        )
+    else:
+        cache = ResultCache(max_bytes=args.cache_size)
+        results = list(
+            run_cached(
+                solvers, cache, args.input, verbosity, args.jobs, args.workers
+            )
+        )
+    wall_seconds = time.perf_counter() - start
+    results.sort(key=lambda r: (r.day, r.part))
+    write_table(results, args.format)
+    if results:
+        slowest = max(results, key=lambda r: r.seconds)
+        print(
+            f"Wall time {wall_seconds:.3f}s, critical path Day {slowest.day:02}"
+            f" Part {slowest.part} ({slowest.seconds:.3f}s)",
+            file=sys.stderr,
+        )
+    return 1 if any(r.error for r in results) else 0
@@ -0,0 +1,44 @@
+import os
+from enum import IntEnum
+
+
+class Verbosity(IntEnum):
+    QUIET = 0
+    NORMAL = 1
+    TRACE = 2
+
+
+def parse_verbosity(value: str | int | Verbosity) -> Verbosity:
+    if isinstance(value, str):
+        return Verbosity[value.upper()]
+    return Verbosity(value)
+
+
+_level = parse_verbosity(os.environ.get("AOC_VERBOSITY", "normal"))
+
+
+def set_verbosity(value: str | int | Verbosity) -> None:
+    global _level
+    _level = parse_verbosity(value)
+
+
+def get_verbosity() -> Verbosity:
+    return _level
+
+
+def tracing() -> bool:
+    """
+    Solvers hoist this into a local before their inner loops and only build
+    per-item diagnostics (f-strings, reprs, renders) when it is set.
+    """
+    return _level >= Verbosity.TRACE
+
+
+def info(*args, **kwargs) -> None:
+    if _level >= Verbosity.NORMAL:
+        print(*args, **kwargs)
+
+
+def trace(*args, **kwargs) -> None:
+    if _level >= Verbosity.TRACE:
+        print(*args, **kwargs)
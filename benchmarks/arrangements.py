@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+Check day 12's count_arrangements against a brute force reference.
+
+Random short records are counted by both parts' count_arrangements and by
+trying every combination of group offsets, which is exponential in the number
+of groups but simple enough to trust. Exits non-zero on the first mismatch.
+"""
+
+import argparse
+import itertools
+import os
+import random
+import sys
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+
+from aoc.runner import discover
+
+
+def is_possible_layout(records: str, groupings: list[int], offsets: list[int]) -> bool:
+    for size, offset, next_offset in zip(groupings[:-1], offsets[:-1], offsets[1:]):
+        if size + offset >= next_offset:
+            return False
+    for position, c in enumerate(records):
+        if c == "?":
+            continue
+        is_group = False
+        for size, offset in zip(groupings, offsets):
+            if offset <= position < offset + size:
+                is_group = True
+                break
+        if (c == "#") != is_group:
+            return False
+    return True
+
+
+def count_arrangements_bruteforce(records: str, groupings: list[int]) -> int:
+    group_positions: list[list[int]] = []
+    for i, size in enumerate(groupings):
+        positions: list[int] = []
+        start = sum(groupings[:i]) + i
+        end = len(records) - sum(groupings[i:]) - len(groupings) + i + 1
+        for offset in range(start, end + 1):
+            if offset > 0 and records[offset - 1] == "#":
+                continue
+            if offset + size < len(records) and records[offset + size] == "#":
+                continue
+            if "." in records[offset:offset + size]:
+                continue
+            positions.append(offset)
+        group_positions.append(positions)
+
+    record_arrangements = 0
+    for offsets in itertools.product(*group_positions):
+        if is_possible_layout(records, groupings, offsets):
+            record_arrangements += 1
+    return record_arrangements
+
+
+def random_record(rng: random.Random, max_length: int) -> tuple[str, list[int]]:
+    records = "".join(rng.choices(".#?", k=rng.randint(1, max_length)))
+    groupings = [rng.randint(1, 4) for _ in range(rng.randint(1, 4))]
+    return records, groupings
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--count", type=int, default=2000, help="records to check")
+    parser.add_argument("--length", type=int, default=14, help="longest record")
+    parser.add_argument("--seed", type=int, default=2023, help="random seed")
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    modules = [solver.load() for solver in discover(days=[12])]
+    for _ in range(args.count):
+        records, groupings = random_record(rng, args.length)
+        expected = count_arrangements_bruteforce(records, groupings)
+        for module in modules:
+            actual = module.count_arrangements(records, groupings)
+            if actual != expected:
+                print(
+                    f"{module.__name__}: {records} {groupings} -> {actual}, "
+                    f"expected {expected}"
+                )
+                return 1
+    print(f"{args.count} records match in {len(modules)} solvers")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
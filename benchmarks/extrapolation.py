@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+"""
+Check aoc.extrapolation.Extrapolator against day 9's predict().
+
+Every history in the input is streamed into an Extrapolator one value at a
+time, with the degree set to the highest the history can pin down, and both
+predictions are compared with predict() on the whole list. A long stream of
+cubic values is then fed to a degree 3 Extrapolator, which keeps four levels
+however many values arrive. Exits non-zero on the first mismatch.
+"""
+
+import argparse
+import os
+import sys
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+
+from aoc.extrapolation import Extrapolator
+from aoc.inputs import read_lines
+from aoc.parsing import extract_ints
+from aoc.runner import discover
+
+
+def cubic(x: int) -> int:
+    return 3 * x**3 - 5 * x**2 + 7 * x - 11
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--input", default="input.txt", help="input file name")
+    parser.add_argument("--stream", type=int, default=100000, help="cubic values")
+    args = parser.parse_args()
+
+    solver = discover(days=[9])[0]
+    predict = solver.load().predict
+    histories = 0
+    for line in read_lines(solver.input_path(args.input)):
+        if not line:
+            continue
+        history = extract_ints(line)
+        extrapolator = Extrapolator(degree=len(history) - 1)
+        for value in history:
+            extrapolator.append(value)
+        streamed = extrapolator.previous, extrapolator.next
+        expected = predict(history, backwards=True), predict(history)
+        if streamed != expected:
+            print(f"{history}: streamed {streamed}, expected {expected}")
+            return 1
+        histories += 1
+    print(f"{histories} histories match")
+
+    extrapolator = Extrapolator(degree=3)
+    for x in range(args.stream):
+        extrapolator.append(cubic(x))
+    streamed = extrapolator.previous, extrapolator.next, len(extrapolator.tails)
+    expected = cubic(-1), cubic(args.stream), 4
+    if streamed != expected:
+        print(f"cubic stream: got {streamed}, expected {expected}")
+        return 1
+    print(f"{args.stream} streamed cubic values match with 4 levels kept")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+"""
+Compare every solver at trace and quiet verbosity.
+
+Trace output is discarded, so the difference is the cost of building the
+diagnostics rather than of the terminal drawing them.
+"""
+
+import argparse
+import contextlib
+import os
+import statistics
+import sys
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+
+from aoc.runner import discover, run_solver
+from aoc.verbosity import Verbosity
+
+
+def median_seconds(solver, input_name: str, verbosity: Verbosity, repeat: int) -> float:
+    samples: list[float] = []
+    for _ in range(repeat):
+        with open(os.devnull, "w", encoding="utf-8") as devnull:
+            with contextlib.redirect_stderr(devnull):
+                result = run_solver(solver, input_name, verbosity)
+        if result.error is not None:
+            raise RuntimeError(f"{solver}: {result.error}")
+        samples.append(result.seconds)
+    return statistics.median(samples)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument(
+        "days", metavar="DAY", type=int, nargs="*", help="only run these days"
+    )
+    parser.add_argument("--input", default="input.txt", help="input file name")
+    parser.add_argument("--repeat", type=int, default=5, help="runs per setting")
+    args = parser.parse_args()
+
+    print("day\tpart\ttrace\tquiet\tspeedup")
+    for solver in discover(days=args.days):
+        if not os.path.exists(solver.input_path(args.input)):
+            continue
+        # Warm up the import so that neither setting pays for it
+        run_solver(solver, args.input)
+        traced = median_seconds(solver, args.input, Verbosity.TRACE, args.repeat)
+        quiet = median_seconds(solver, args.input, Verbosity.QUIET, args.repeat)
+        print(
+            f"{solver.day}\t{solver.part}\t{traced:.6f}\t{quiet:.6f}\t{traced / quiet:.1f}x"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
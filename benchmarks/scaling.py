@@ -0,0 +1,217 @@
+#!/usr/bin/env python3
+"""
+Measure how every solver scales with the size of its input.
+
+Each day's input is enlarged by a series of factors (1x, 4x and 16x by
+default), every solver is timed on each size and its peak traced memory is
+recorded. The growth exponent is the least squares slope of log(time) against
+log(factor), so ~1 is linear and ~2 is quadratic. Solvers above the threshold
+are flagged.
+"""
+
+import argparse
+import contextlib
+import json
+import math
+import os
+import statistics
+import sys
+import tempfile
+import tracemalloc
+from typing import Callable
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+
+from aoc.runner import Solver, discover, run_solver
+
+
+def repeat_lines(text: str, factor: int) -> str:
+    lines = text.rstrip("\n") + "\n"
+    return lines * factor
+
+
+def repeat_blocks(text: str, factor: int) -> str:
+    block = text.strip("\n") + "\n"
+    return "\n".join([block] * factor)
+
+
+def repeat_sequence(text: str, factor: int) -> str:
+    return ",".join([text.strip()] * factor) + "\n"
+
+
+def tile_grid(text: str, factor: int, *, gap: str = "", start: str = "") -> str:
+    """
+    Tiles the grid as close to a square as possible, so 4x is 2 by 2. A gap
+    column keeps numbers from running into the next tile and any start marker
+    is only kept in the top left tile.
+    """
+    rows = [r for r in text.splitlines() if r]
+    across = math.isqrt(factor)
+    down = factor // across
+    copy = [r.replace(start, ".") for r in rows] if start else rows
+    lines: list[str] = []
+    for tile_y in range(down):
+        for y, row in enumerate(rows):
+            tiles = [copy[y]] * across
+            if tile_y == 0:
+                tiles[0] = row
+            lines.append(gap.join(tiles))
+    return "\n".join(lines) + "\n"
+
+
+def repeat_seeds(text: str, factor: int) -> str:
+    seeds, rest = text.split("\n", 1)
+    label, numbers = seeds.split(":", 1)
+    return f"{label}:{numbers.rstrip() * factor}\n{rest}"
+
+
+# Days that are missing here have inputs that cannot be enlarged without
+# changing the puzzle (day06 is a handful of races, day08 a fixed network).
+SCALERS: dict[int, Callable[[str, int], str]] = {
+    1: repeat_lines,
+    2: repeat_lines,
+    3: lambda text, factor: tile_grid(text, factor, gap="."),
+    4: repeat_lines,
+    5: repeat_seeds,
+    7: repeat_lines,
+    9: repeat_lines,
+    10: lambda text, factor: tile_grid(text, factor, start="S"),
+    11: tile_grid,
+    12: repeat_lines,
+    13: repeat_blocks,
+    14: tile_grid,
+    15: repeat_sequence,
+}
+
+
+def measure(solver: Solver, path: str, repeat: int) -> dict:
+    samples: list[float] = []
+    answer = None
+    for _ in range(repeat):
+        result = run_solver(solver, path)
+        if result.error is not None:
+            raise RuntimeError(f"{solver}: {result.error}")
+        samples.append(result.seconds)
+        answer = result.answer
+    # Tracing allocations slows the solver down, so memory gets its own run
+    tracemalloc.start()
+    try:
+        run_solver(solver, path)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return {
+        "answer": answer,
+        "bytes": os.path.getsize(path),
+        "median_seconds": round(statistics.median(samples), 6),
+        "peak_bytes": peak,
+    }
+
+
+def growth_exponent(sizes: list[dict]) -> float | None:
+    points = [
+        (math.log(s["factor"]), math.log(s["median_seconds"]))
+        for s in sizes
+        if s["median_seconds"] > 0
+    ]
+    if len(points) < 2:
+        return None
+    mean_x = statistics.fmean(x for x, _ in points)
+    mean_y = statistics.fmean(y for _, y in points)
+    numerator = sum((x - mean_x) * (y - mean_y) for x, y in points)
+    denominator = sum((x - mean_x) ** 2 for x, _ in points)
+    return round(numerator / denominator, 3)
+
+
+def benchmark(
+    solver: Solver,
+    input_name: str,
+    factors: list[int],
+    repeat: int,
+    budget: float,
+    directory: str,
+) -> dict:
+    with open(solver.input_path(input_name), "r", encoding="utf-8") as f:
+        text = f.read()
+    sizes: list[dict] = []
+    for factor in factors:
+        path = os.path.join(directory, f"day{solver.day:02}_x{factor}.txt")
+        if not os.path.exists(path):
+            with open(path, "w", encoding="utf-8") as f:
+                f.write(SCALERS[solver.day](text, factor))
+        sizes.append({"factor": factor, **measure(solver, path, repeat)})
+        if sizes[-1]["median_seconds"] > budget:
+            break
+    return {
+        "day": solver.day,
+        "part": solver.part,
+        "exponent": growth_exponent(sizes),
+        "sizes": sizes,
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument(
+        "days", metavar="DAY", type=int, nargs="*", help="only run these days"
+    )
+    parser.add_argument("--input", default="input.txt", help="input file name")
+    parser.add_argument(
+        "--factors",
+        type=lambda x: [int(f) for f in x.split(",")],
+        default=[1, 4, 16],
+        help="comma separated size multipliers (default: 1,4,16)",
+    )
+    parser.add_argument("--repeat", type=int, default=3, help="timed runs per size")
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=1.5,
+        help="flag solvers whose growth exponent exceeds this (default: 1.5)",
+    )
+    parser.add_argument(
+        "--budget",
+        type=float,
+        default=30.0,
+        help="stop enlarging a solver once a size takes longer (default: 30s)",
+    )
+    parser.add_argument("--output", help="write the JSON report here, not stdout")
+    args = parser.parse_args()
+
+    solvers: list[dict] = []
+    with tempfile.TemporaryDirectory() as directory:
+        for solver in discover(days=args.days):
+            if solver.day not in SCALERS:
+                continue
+            if not os.path.exists(solver.input_path(args.input)):
+                continue
+            report = benchmark(
+                solver, args.input, args.factors, args.repeat, args.budget, directory
+            )
+            report["flagged"] = (
+                report["exponent"] is not None and report["exponent"] > args.threshold
+            )
+            solvers.append(report)
+            print(
+                f"{solver}: exponent {report['exponent']}",
+                "<- superlinear" if report["flagged"] else "",
+                file=sys.stderr,
+            )
+
+    report = {
+        "factors": args.factors,
+        "input": args.input,
+        "threshold": args.threshold,
+        "solvers": solvers,
+    }
+    with contextlib.ExitStack() as stack:
+        output = sys.stdout
+        if args.output:
+            output = stack.enter_context(open(args.output, "w", encoding="utf-8"))
+        json.dump(report, output, indent=2, sort_keys=True)
+        output.write("\n")
+    return 1 if any(s["flagged"] for s in solvers) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
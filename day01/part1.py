@@ -2,14 +2,19 @@
 
 import os
 import sys
+from typing import Iterable
 
-filename = os.path.join(os.path.dirname(__file__), "input.txt")
-if len(sys.argv) > 1:
-    filename = sys.argv[-1]
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
 
-with open(filename, "r", encoding="utf-8") as f:
+from aoc.chunks import map_chunks
+from aoc.phases import SOLVE, phase
+from aoc.verbosity import info, tracing
+
+
+def calibration_sum(lines: Iterable[str]) -> int:
+    trace = tracing()
     numbers: list[int] = []
-    for line in f.readlines():
+    for line in lines:
         first_digit: int | None = None
         for c in line:
             if c.isnumeric():
@@ -17,9 +22,25 @@ with open(filename, "r", encoding="utf-8") as f:
                     first_digit = int(c)
                 last_digit = int(c)
         if first_digit is None:
-            print(line.strip())
+            if trace:
+                print(line.strip())
             continue
         number = first_digit * 10 + last_digit
-        print(number, "<-", line.strip())
+        if trace:
+            print(number, "<-", line.strip())
         numbers.append(number)
-    print("Total:", sum(numbers))
+    return sum(numbers)
+
+
+def run(path: os.PathLike) -> str:
+    with phase(SOLVE):
+        result = map_chunks(path, calibration_sum, sum)
+    info("Total:", result)
+    return str(result)
+
+
+if __name__ == "__main__":
+    filename = os.path.join(os.path.dirname(__file__), "input.txt")
+    if len(sys.argv) > 1:
+        filename = sys.argv[-1]
+    run(filename)
@@ -3,6 +3,13 @@
 import os
 import re
 import sys
+from typing import Iterable
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+
+from aoc.chunks import map_chunks
+from aoc.phases import SOLVE, phase
+from aoc.verbosity import info, tracing
 
 
 STR_NUMBERS = [
@@ -18,9 +25,7 @@ STR_NUMBERS = [
     "nine",
 ]
 
-filename = os.path.join(os.path.dirname(__file__), "input.txt")
-if len(sys.argv) > 1:
-    filename = sys.argv[-1]
+number_pattern = re.compile(f"(?=({'|'.join(STR_NUMBERS)}))")
 
 
 def convert_number(text):
@@ -29,19 +34,35 @@ def convert_number(text):
     return STR_NUMBERS.index(text)
 
 
-with open(filename, "r", encoding="utf-8") as f:
+def calibration_sum(lines: Iterable[str]) -> int:
+    trace = tracing()
     numbers: list[int] = []
-    pattern = re.compile(f"(?=({'|'.join(STR_NUMBERS)}))")
-    for line in f.readlines():
+    for line in lines:
         first_digit: int | None = None
-        for match in pattern.finditer(line):
+        for match in number_pattern.finditer(line):
             if first_digit is None:
                 first_digit = convert_number(match.group(1))
             last_digit = convert_number(match.group(1))
         if first_digit is None:
-            print(line.strip())
+            if trace:
+                print(line.strip())
             continue
         number = first_digit * 10 + last_digit
-        print(number, "<-", line.strip())
+        if trace:
+            print(number, "<-", line.strip())
         numbers.append(number)
-    print("Total:", sum(numbers))
+    return sum(numbers)
+
+
+def run(path: os.PathLike) -> str:
+    with phase(SOLVE):
+        result = map_chunks(path, calibration_sum, sum)
+    info("Total:", result)
+    return str(result)
+
+
+if __name__ == "__main__":
+    filename = os.path.join(os.path.dirname(__file__), "input.txt")
+    if len(sys.argv) > 1:
+        filename = sys.argv[-1]
+    run(filename)
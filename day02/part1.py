@@ -3,10 +3,13 @@
 import re
 import os
 import sys
+from typing import Iterable
 
-filename = os.path.join(os.path.dirname(__file__), "input.txt")
-if len(sys.argv) > 1:
-    filename = sys.argv[-1]
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+
+from aoc.chunks import map_chunks
+from aoc.phases import SOLVE, phase
+from aoc.verbosity import info, tracing
 
 max_colours = {
     "red": 12,
@@ -17,9 +20,11 @@ max_colours = {
 game_pattern = re.compile(r"Game ([0-9]+)")
 hand_pattern = re.compile(r"([0-9]+) (blue|red|green)")
 
-with open(filename, "r", encoding="utf-8") as f:
+
+def possible_games_sum(lines: Iterable[str]) -> int:
+    trace = tracing()
     possible_games: list[int] = []
-    for line in f.readlines():
+    for line in lines:
         game_str, data_str = line.split(":", 1)
         game_id = int(game_pattern.match(game_str).group(1))
         impossible_hand = False
@@ -29,8 +34,23 @@ with open(filename, "r", encoding="utf-8") as f:
                 colour = cubes.group(2)
                 if max_colours[colour] < number:
                     impossible_hand = True
-        print("Game", game_id, "Impossible" if impossible_hand else "OK")
+        if trace:
+            print("Game", game_id, "Impossible" if impossible_hand else "OK")
         if impossible_hand:
             continue
         possible_games.append(game_id)
-    print("Sum of Possible Game IDs:", sum(possible_games))
+    return sum(possible_games)
+
+
+def run(path: os.PathLike) -> str:
+    with phase(SOLVE):
+        result = map_chunks(path, possible_games_sum, sum)
+    info("Sum of Possible Game IDs:", result)
+    return str(result)
+
+
+if __name__ == "__main__":
+    filename = os.path.join(os.path.dirname(__file__), "input.txt")
+    if len(sys.argv) > 1:
+        filename = sys.argv[-1]
+    run(filename)
@@ -3,17 +3,22 @@
 import re
 import os
 import sys
+from typing import Iterable
 
-filename = os.path.join(os.path.dirname(__file__), "input.txt")
-if len(sys.argv) > 1:
-    filename = sys.argv[-1]
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+
+from aoc.chunks import map_chunks
+from aoc.phases import SOLVE, phase
+from aoc.verbosity import info, tracing
 
 game_pattern = re.compile(r"Game ([0-9]+)")
 hand_pattern = re.compile(r"([0-9]+) (blue|red|green)")
 
-with open(filename, "r", encoding="utf-8") as f:
+
+def power_sum(lines: Iterable[str]) -> int:
+    trace = tracing()
     powers: list[int] = []
-    for line in f.readlines():
+    for line in lines:
         game_str, data_str = line.split(":", 1)
         game_id = int(game_pattern.match(game_str).group(1))
         max_colours = {
@@ -29,6 +34,21 @@ with open(filename, "r", encoding="utf-8") as f:
         power = 1
         for number in max_colours.values():
             power *= number
-        print("Game", game_id, "Power", power)
+        if trace:
+            print("Game", game_id, "Power", power)
         powers.append(power)
-    print("Sum of Game Power:", sum(powers))
+    return sum(powers)
+
+
+def run(path: os.PathLike) -> str:
+    with phase(SOLVE):
+        result = map_chunks(path, power_sum, sum)
+    info("Sum of Game Power:", result)
+    return str(result)
+
+
+if __name__ == "__main__":
+    filename = os.path.join(os.path.dirname(__file__), "input.txt")
+    if len(sys.argv) > 1:
+        filename = sys.argv[-1]
+    run(filename)
@@ -1,8 +1,15 @@
 #!/usr/bin/env python3
 
 import os
+import re
 import sys
 
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+
+from aoc.grid import Grid
+from aoc.phases import PARSE, SOLVE, phase
+from aoc.verbosity import info, tracing
+
 
 class Symbol:
     def __init__(self, x: int, y: int, value: str):
@@ -28,52 +35,63 @@ class Number:
         return f"{coord}: {self.value}{'*' if self.is_partnumber else ''}"
 
 
-def build_schematic(filename):
+number_pattern = re.compile(rb"[0-9]+")
+symbol_pattern = re.compile(rb"[^.0-9]")
+
+
+def build_schematic(filename: os.PathLike) -> tuple[Grid, list[Number], list[Symbol]]:
+    grid = Grid.read(filename)
     numbers: list[Number] = []
     symbols: list[Symbol] = []
-    with open(filename, "r", encoding="utf-8") as f:
-        for y, line in enumerate(f.readlines()):
-            current_number = []
-            for x, c in enumerate(line):
-                if c.isdigit():
-                    current_number.append(c)
-                    continue
-                elif len(current_number) > 0:
-                    value = int("".join(current_number))
-                    numbers.append(
-                        Number(
-                            x1=x - len(current_number),
-                            x2=x - 1,
-                            y=y,
-                            value=value,
-                        )
-                    )
-                    current_number = []
-                if c == "." or c == "\n":
-                    continue
-                symbols.append(
-                    Symbol(
-                        x=x,
-                        y=y,
-                        value=c,
-                    )
+    for y, row in enumerate(grid.rows()):
+        for match in number_pattern.finditer(row):
+            numbers.append(
+                Number(
+                    x1=match.start(),
+                    x2=match.end() - 1,
+                    y=y,
+                    value=int(match.group()),
                 )
-    for sym in symbols:
-        print(sym)
+            )
+        for match in symbol_pattern.finditer(row):
+            symbols.append(
+                Symbol(
+                    x=match.start(),
+                    y=y,
+                    value=match.group().decode("ascii"),
+                )
+            )
+    return grid, numbers, symbols
+
+
+def run(path: os.PathLike) -> str:
+    trace = tracing()
+    with phase(PARSE):
+        grid, numbers, symbols = build_schematic(path)
+    with phase(SOLVE):
+        # Mark every cell touching a symbol, then a number is a part number
+        # if any of its digits sits on a marked cell.
+        near_symbol = bytearray(len(grid.data))
+        for sym in symbols:
+            if trace:
+                print(sym)
+            near_symbol[grid.index(sym.x, sym.y)] = 1
+            for x, y in grid.neighbours(sym.x, sym.y, diagonal=True):
+                near_symbol[grid.index(x, y)] = 1
         for num in numbers:
-            if num.y < sym.y - 1 or num.y > sym.y + 1:
-                continue
-            if num.x2 < sym.x - 1 or num.x1 > sym.x + 1:
-                continue
-            num.is_partnumber = True
-    for num in numbers:
-        print(num)
-    part_numbers = [n.value for n in numbers if n.is_partnumber]
-    print("Total:", sum(part_numbers))
+            start = grid.index(num.x1, num.y)
+            num.is_partnumber = any(near_symbol[start : start + num.x2 - num.x1 + 1])
+        if trace:
+            for num in numbers:
+                print(num)
+        part_numbers = [n.value for n in numbers if n.is_partnumber]
+        result = sum(part_numbers)
+    info("Total:", result)
+    return str(result)
 
 
 if __name__ == "__main__":
     filename = os.path.join(os.path.dirname(__file__), "input.txt")
     if len(sys.argv) > 1:
         filename = sys.argv[-1]
-    build_schematic(filename)
+    run(filename)
@@ -1,7 +1,15 @@
 #!/usr/bin/env python3
 
 import os
+import re
 import sys
+from array import array
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+
+from aoc.grid import Grid
+from aoc.phases import PARSE, SOLVE, phase
+from aoc.verbosity import info, tracing
 
 
 class Symbol:
@@ -29,54 +37,68 @@ class Number:
         return f"{coord}: {self.value}{'*' if self.is_partnumber else ''}"
 
 
-def build_schematic(filename):
+number_pattern = re.compile(rb"[0-9]+")
+symbol_pattern = re.compile(rb"[^.0-9]")
+
+
+def build_schematic(filename: os.PathLike) -> tuple[Grid, list[Number], list[Symbol]]:
+    grid = Grid.read(filename)
     numbers: list[Number] = []
     symbols: list[Symbol] = []
-    with open(filename, "r", encoding="utf-8") as f:
-        for y, line in enumerate(f.readlines()):
-            current_number = []
-            for x, c in enumerate(line):
-                if c.isdigit():
-                    current_number.append(c)
-                    continue
-                elif len(current_number) > 0:
-                    value = int("".join(current_number))
-                    numbers.append(
-                        Number(
-                            x1=x - len(current_number),
-                            x2=x - 1,
-                            y=y,
-                            value=value,
-                        )
-                    )
-                    current_number = []
-                if c == "." or c == "\n":
-                    continue
-                symbols.append(
-                    Symbol(
-                        x=x,
-                        y=y,
-                        value=c,
-                    )
+    for y, row in enumerate(grid.rows()):
+        for match in number_pattern.finditer(row):
+            numbers.append(
+                Number(
+                    x1=match.start(),
+                    x2=match.end() - 1,
+                    y=y,
+                    value=int(match.group()),
                 )
-    for sym in symbols:
-        adjacent_numbers = []
-        for num in numbers:
-            if num.y < sym.y - 1 or num.y > sym.y + 1:
-                continue
-            if num.x2 < sym.x - 1 or num.x1 > sym.x + 1:
-                continue
-            num.is_partnumber = True
-            adjacent_numbers.append(num)
-        if sym.value == "*" and len(adjacent_numbers) == 2:
-            sym.gear_ratio = adjacent_numbers[0].value * adjacent_numbers[1].value
-            print(sym)
-    gear_ratios = [s.gear_ratio for s in symbols]
-    print("Total:", sum(gear_ratios))
+            )
+        for match in symbol_pattern.finditer(row):
+            symbols.append(
+                Symbol(
+                    x=match.start(),
+                    y=y,
+                    value=match.group().decode("ascii"),
+                )
+            )
+    return grid, numbers, symbols
+
+
+def run(path: os.PathLike) -> str:
+    trace = tracing()
+    with phase(PARSE):
+        grid, numbers, symbols = build_schematic(path)
+    with phase(SOLVE):
+        # Label every digit cell with the index of the number it belongs to,
+        # so each symbol only has to look at its own neighbours.
+        labels = array("i", [-1]) * len(grid.data)
+        for label, num in enumerate(numbers):
+            start = grid.index(num.x1, num.y)
+            for index in range(start, start + num.x2 - num.x1 + 1):
+                labels[index] = label
+        for sym in symbols:
+            adjacent_labels = {
+                labels[grid.index(x, y)]
+                for x, y in grid.neighbours(sym.x, sym.y, diagonal=True)
+            }
+            adjacent_labels.discard(-1)
+            adjacent_numbers = [numbers[label] for label in sorted(adjacent_labels)]
+            for num in adjacent_numbers:
+                num.is_partnumber = True
+            if sym.value == "*" and len(adjacent_numbers) == 2:
+                sym.gear_ratio = adjacent_numbers[0].value * adjacent_numbers[1].value
+                if trace:
+                    print(sym)
+        gear_ratios = [s.gear_ratio for s in symbols]
+        result = sum(gear_ratios)
+    info("Total:", result)
+    return str(result)
 
 
 if __name__ == "__main__":
     filename = os.path.join(os.path.dirname(__file__), "input.txt")
     if len(sys.argv) > 1:
         filename = sys.argv[-1]
-    build_schematic(filename)
+    run(filename)
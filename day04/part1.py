@@ -1,11 +1,15 @@
 #!/usr/bin/env python3
 
 import os
-import re
 import sys
+from typing import Iterable
 
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
 
-card_regex = re.compile(r"Card\s+([0-9]+): ([0-9 ]+)\|([0-9 ]+)")
+from aoc.chunks import map_chunks
+from aoc.parsing import extract_ints
+from aoc.phases import SOLVE, phase
+from aoc.verbosity import info, tracing
 
 
 class Card:
@@ -19,28 +23,35 @@ class Card:
         return f"Card {self.card_id} Score: {self.score}"
 
 
-def run(path) -> str:
-    with open(path, "r", encoding="utf-8") as f:
-        cards: list[Card] = []
-        for line in f.readlines():
-            matches = card_regex.match(line)
-            if matches is None:
-                continue
-            card_id = int(matches.group(1))
-            winning_numbers = [int(x) for x in matches.group(2).split(" ") if x]
-            owned_numbers = [int(x) for x in matches.group(3).split(" ") if x]
-            cards.append(Card(card_id, winning_numbers, owned_numbers,))
-        for c in cards:
-            for number in c.owned_numbers:
-                if number in c.winning_numbers:
-                    if c.score == 0:
-                        c.score = 1
-                    else:
-                        c.score *= 2
+def score_sum(lines: Iterable[str]) -> int:
+    trace = tracing()
+    cards: list[Card] = []
+    for line in lines:
+        if not line:
+            continue
+        card_str, numbers_str = line.split(":", 1)
+        winning_str, owned_str = numbers_str.split("|", 1)
+        card_id = extract_ints(card_str, signed=False)[0]
+        winning_numbers = extract_ints(winning_str, signed=False)
+        owned_numbers = extract_ints(owned_str, signed=False)
+        cards.append(Card(card_id, winning_numbers, owned_numbers,))
+    for c in cards:
+        for number in c.owned_numbers:
+            if number in c.winning_numbers:
+                if c.score == 0:
+                    c.score = 1
+                else:
+                    c.score *= 2
+        if trace:
             print(c)
-        scores = [c.score for c in cards]
-        result = sum(scores)
-        print("Total:", result)
+    scores = [c.score for c in cards]
+    return sum(scores)
+
+
+def run(path) -> str:
+    with phase(SOLVE):
+        result = map_chunks(path, score_sum, sum)
+    info("Total:", result)
     return str(result)
 
 
@@ -1,11 +1,14 @@
 #!/usr/bin/env python3
 
 import os
-import re
 import sys
 
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
 
-card_regex = re.compile(r"Card\s+([0-9]+): ([0-9 ]+)\|([0-9 ]+)")
+from aoc.inputs import read_lines
+from aoc.parsing import extract_ints
+from aoc.phases import PARSE, SOLVE, phase
+from aoc.verbosity import info, tracing
 
 
 class Card:
@@ -21,16 +24,19 @@ class Card:
 
 
 def run(path) -> str:
-    with open(path, "r", encoding="utf-8") as f:
+    trace = tracing()
+    with phase(PARSE):
         cards: list[Card] = []
-        for line in f.readlines():
-            matches = card_regex.match(line)
-            if matches is None:
+        for line in read_lines(path):
+            if not line:
                 continue
-            card_id = int(matches.group(1))
-            winning_numbers = [int(x) for x in matches.group(2).split(" ") if x]
-            owned_numbers = [int(x) for x in matches.group(3).split(" ") if x]
+            card_str, numbers_str = line.split(":", 1)
+            winning_str, owned_str = numbers_str.split("|", 1)
+            card_id = extract_ints(card_str, signed=False)[0]
+            winning_numbers = extract_ints(winning_str, signed=False)
+            owned_numbers = extract_ints(owned_str, signed=False)
             cards.append(Card(card_id, winning_numbers, owned_numbers,))
+    with phase(SOLVE):
         for i, c in enumerate(cards):
             instances = c.instances
             for number in c.owned_numbers:
@@ -38,10 +44,11 @@ def run(path) -> str:
                     c.score += 1
             for offset in range(1, c.score + 1):
                 cards[i + offset].instances += instances
-            print(c)
+            if trace:
+                print(c)
         card_instances = [c.instances for c in cards]
         result = sum(card_instances)
-        print("Total:", result)
+    info("Total:", result)
     return str(result)
 
 
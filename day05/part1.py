@@ -5,6 +5,13 @@ import re
 import sys
 from dataclasses import dataclass, field
 
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+
+from aoc.inputs import read_blocks
+from aoc.parsing import extract_ints
+from aoc.phases import PARSE, SOLVE, phase
+from aoc.verbosity import info, tracing
+
 required_seeds_pattern = re.compile(r"seeds: ([0-9 ]+)")
 map_header_pattern = re.compile(r"(\w+)-to-(\w+) map:")
 map_range_pattern = re.compile(r"([0-9+])\s+([0-9]+)\s+([0-9]+)")
@@ -40,27 +47,21 @@ class Mapper:
 
 
 def run(path) -> str:
-    required_seeds: list[int] | None = None
-    current_map: Mapper | None = None
-    maps: dict[str, Mapper] = {}
-
-    with open(path, "r", encoding="utf-8") as f:
-        for line in f.readlines():
-            line = line.strip()
-            if len(line) == 0:
-                current_map = None
-            elif required_seeds is None:
-                search = required_seeds_pattern.match(line)
-                required_seeds = [int(x) for x in search.group(1).split(" ") if x]
-            elif current_map is None:
-                search = map_header_pattern.match(line)
-                current_map = Mapper(
-                    src=search.group(1),
-                    dest=search.group(2),
-                )
-                maps[current_map.src] = current_map
-            else:
-                values = [int(x) for x in line.split(" ") if x]
+    with phase(PARSE):
+        maps: dict[str, Mapper] = {}
+
+        blocks = read_blocks(path)
+        search = required_seeds_pattern.match(next(blocks)[0])
+        required_seeds = extract_ints(search.group(1), signed=False)
+        for header, *lines in blocks:
+            search = map_header_pattern.match(header)
+            current_map = Mapper(
+                src=search.group(1),
+                dest=search.group(2),
+            )
+            maps[current_map.src] = current_map
+            for line in lines:
+                values = extract_ints(line, signed=False)
                 section = MapperRange(
                     dest=values[0],
                     src=values[1],
@@ -68,21 +69,24 @@ def run(path) -> str:
                 )
                 current_map.add_section(section)
 
-    chain: list[Mapper] = [maps["seed"]]
-    while chain[-1].dest in maps:
-        chain.append(maps[chain[-1].dest])
-    print("Conversion chain:", " -> ".join(["seed", *[c.dest for c in chain]]))
-
-    required_locations = []
-    for seed in required_seeds:
-        location = seed
-        for mapper in chain:
-            location = mapper[location]
-        required_locations.append(location)
-        print("Seed:", seed, "-> Location:", location)
-
-    result = min(required_locations)
-    print("Closest locaiton:", result)
+    with phase(SOLVE):
+        chain: list[Mapper] = [maps["seed"]]
+        while chain[-1].dest in maps:
+            chain.append(maps[chain[-1].dest])
+        info("Conversion chain:", " -> ".join(["seed", *[c.dest for c in chain]]))
+
+        trace = tracing()
+        required_locations = []
+        for seed in required_seeds:
+            location = seed
+            for mapper in chain:
+                location = mapper[location]
+            required_locations.append(location)
+            if trace:
+                print("Seed:", seed, "-> Location:", location)
+
+        result = min(required_locations)
+    info("Closest locaiton:", result)
     return str(result)
 
 
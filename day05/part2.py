@@ -5,6 +5,13 @@ import re
 import sys
 from dataclasses import dataclass, field
 
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+
+from aoc.inputs import read_blocks
+from aoc.parsing import extract_ints
+from aoc.phases import PARSE, SOLVE, phase
+from aoc.verbosity import info, tracing
+
 required_seeds_pattern = re.compile(r"seeds: ([0-9 ]+)")
 map_header_pattern = re.compile(r"(\w+)-to-(\w+) map:")
 map_range_pattern = re.compile(r"([0-9+])\s+([0-9]+)\s+([0-9]+)")
@@ -86,37 +93,31 @@ class Mapper:
 
 
 def run(path) -> str:
-    required_seeds: list[int] | None = None
-    current_map: Mapper | None = None
-    maps: dict[str, Mapper] = {}
-
-    with open(path, "r", encoding="utf-8") as f:
-        for line in f.readlines():
-            line = line.strip()
-            if len(line) == 0:
-                current_map = None
-            elif required_seeds is None:
-                search = required_seeds_pattern.match(line)
-                seed_array = [int(x) for x in search.group(1).split(" ") if x]
-                required_seeds = []
-                for i in range(0, len(seed_array), 2):
-                    start = seed_array[i]
-                    end = start + seed_array[i + 1] - 1
-                    required_seeds.append(
-                        Range(
-                            start=start,
-                            end=end,
-                        )
-                    )
-            elif current_map is None:
-                search = map_header_pattern.match(line)
-                current_map = Mapper(
-                    src=search.group(1),
-                    dest=search.group(2),
+    with phase(PARSE):
+        maps: dict[str, Mapper] = {}
+
+        blocks = read_blocks(path)
+        search = required_seeds_pattern.match(next(blocks)[0])
+        seed_array = extract_ints(search.group(1), signed=False)
+        required_seeds: list[Range] = []
+        for i in range(0, len(seed_array), 2):
+            start = seed_array[i]
+            end = start + seed_array[i + 1] - 1
+            required_seeds.append(
+                Range(
+                    start=start,
+                    end=end,
                 )
-                maps[current_map.src] = current_map
-            else:
-                values = [int(x) for x in line.split(" ") if x]
+            )
+        for header, *lines in blocks:
+            search = map_header_pattern.match(header)
+            current_map = Mapper(
+                src=search.group(1),
+                dest=search.group(2),
+            )
+            maps[current_map.src] = current_map
+            for line in lines:
+                values = extract_ints(line, signed=False)
                 start = values[1]
                 end = start + values[2] - 1
                 offset = values[0] - start
@@ -127,22 +128,26 @@ def run(path) -> str:
                 )
                 current_map.add_section(section)
 
-    chain: list[Mapper] = [maps["seed"]]
-    while chain[-1].dest in maps:
-        chain.append(maps[chain[-1].dest])
-
-    required_locations = []
-    for seeds in required_seeds:
-        print("=" * 20)
-        print(seeds)
-        locations = [seeds]
-        for mapper in chain:
-            locations = mapper.map_value(locations)
-        required_locations.extend(locations)
-        print(locations)
-
-    result = min(l.start for l in required_locations)
-    print("Closest locaiton:", result)
+    with phase(SOLVE):
+        chain: list[Mapper] = [maps["seed"]]
+        while chain[-1].dest in maps:
+            chain.append(maps[chain[-1].dest])
+
+        trace = tracing()
+        required_locations = []
+        for seeds in required_seeds:
+            if trace:
+                print("=" * 20)
+                print(seeds)
+            locations = [seeds]
+            for mapper in chain:
+                locations = mapper.map_value(locations)
+            required_locations.extend(locations)
+            if trace:
+                print(locations)
+
+        result = min(l.start for l in required_locations)
+    info("Closest locaiton:", result)
     return str(result)
 
 
@@ -4,13 +4,20 @@ import math
 import os
 import sys
 
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+
+from aoc.inputs import read_lines
+from aoc.parsing import extract_ints
+from aoc.phases import PARSE, SOLVE, phase
+from aoc.verbosity import info, tracing
+
 
 CHARGE_RATE = 1.0
 
 
-def read_numbers(line: str) -> list[float]:
+def read_numbers(line: str) -> list[int]:
     number_str = line.split(":", 1)[1]
-    return [int(x) for x in number_str.split(" ") if x]
+    return extract_ints(number_str, signed=False)
 
 
 def minimum_distance(
@@ -47,10 +54,13 @@ def minimum_distance(
 
 
 def run(path: os.PathLike) -> str:
+    trace = tracing()
     result = 1
-    with open(path, "r", encoding="utf-8") as f:
-        times = read_numbers(f.readline().strip())
-        distances = read_numbers(f.readline().strip())
+    with phase(PARSE):
+        lines = read_lines(path)
+        times = read_numbers(next(lines))
+        distances = read_numbers(next(lines))
+    with phase(SOLVE):
         for index, time, distance in zip(range(len(times)), times, distances):
             # We add 0.1mm to the distance to take into account the discrete
             # nature of how time and distances are calculated here.
@@ -59,10 +69,11 @@ def run(path: os.PathLike) -> str:
             x2 = math.floor(x2)
             margin = x2 - x1 + 1
             result *= margin
-            print(
-                f"Race {index + 1}: ({distance}mm@{time}ms) {x1}ms~{x2}ms (Margin: {margin})"
-            )
-    print("Product of number of ways:", result)
+            if trace:
+                print(
+                    f"Race {index + 1}: ({distance}mm@{time}ms) {x1}ms~{x2}ms (Margin: {margin})"
+                )
+    info("Product of number of ways:", result)
     return str(result)
 
 
@@ -4,6 +4,12 @@ import math
 import os
 import sys
 
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+
+from aoc.inputs import read_lines
+from aoc.phases import PARSE, SOLVE, phase
+from aoc.verbosity import info, tracing
+
 
 CHARGE_RATE = 1.0
 
@@ -47,17 +53,20 @@ def minimum_distance(
 
 
 def run(path: os.PathLike) -> str:
-    with open(path, "r", encoding="utf-8") as f:
-        time = read_numbers(f.readline().strip())
-        distance = read_numbers(f.readline().strip())
+    with phase(PARSE):
+        lines = read_lines(path)
+        time = read_numbers(next(lines))
+        distance = read_numbers(next(lines))
+    with phase(SOLVE):
         # We add 0.1mm to the distance to take into account the discrete
         # nature of how time and distances are calculated here.
         x1, x2 = minimum_distance(float(time), float(distance) + 0.1)
         x1 = math.ceil(x1)
         x2 = math.floor(x2)
         margin = x2 - x1 + 1
+    if tracing():
         print(f"Race: ({distance}mm@{time}ms) {x1}ms~{x2}ms (Margin: {margin})")
-    print("Number of ways:", margin)
+    info("Number of ways:", margin)
     return str(margin)
 
 
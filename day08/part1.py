@@ -3,55 +3,145 @@
 import os
 import re
 import sys
-from dataclasses import dataclass
+from array import array
+from dataclasses import dataclass, field
+from typing import Iterable, Self
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+
+from aoc.inputs import read_lines
+from aoc.phases import PARSE, SOLVE, phase
+from aoc.verbosity import info, tracing
 
 
 node_pattern = re.compile(r"([A-Z]+) = \(([A-Z]+), ([A-Z]+)\)")
 
-@dataclass
-class Node:
-    name: str
-    left_exit: str
-    right_exit: str
 
-    def __repr__(self) -> str:
-        return f"<node {self.name}>"
+@dataclass
+class Network:
+    """
+    The nodes numbered in input order, with the left and right exits of
+    each as node numbers and the instructions as 0 for left, 1 for right.
+    """
 
+    instructions: bytes
+    names: list[str]
+    left: array
+    right: array
+    indices: dict[str, int] = field(default_factory=dict)
 
-def run(path: os.PathLike) -> str:
-    instructions: str | None = None
-    nodes: dict[str, Node] = {}
-    with open(path, "r", encoding="utf-8") as f:
-        for line in f.readlines():
-            line = line.strip()
+    @classmethod
+    def parse(cls, lines: Iterable[str]) -> Self:
+        instructions: str | None = None
+        exits: list[tuple[str, str, str]] = []
+        for line in lines:
             if len(line) == 0:
                 continue
             if instructions is None:
                 instructions = line
                 continue
             matches = node_pattern.match(line)
-            node = Node(
-                matches.group(1),
-                matches.group(2),
-                matches.group(3),
+            exits.append((matches.group(1), matches.group(2), matches.group(3)))
+        names = [name for name, _, _ in exits]
+        indices = {name: i for i, name in enumerate(names)}
+        return cls(
+            instructions.translate(str.maketrans("LR", "\x00\x01")).encode("ascii"),
+            names,
+            array("i", (indices[left] for _, left, _ in exits)),
+            array("i", (indices[right] for _, _, right in exits)),
+            indices,
+        )
+
+
+class PassTable:
+    """
+    Where every node ends up after one full pass over the instructions, and
+    the steps into the pass at which it reaches a target node.
+
+    Lifting the pass table to 2, 4, 8... passes, along with whether a target
+    is reached within them, means finding the first target or skipping
+    ahead any number of steps costs a lookup per bit instead of a step per
+    instruction.
+    """
+
+    def __init__(self, network: Network, targets: bytes) -> None:
+        self.network = network
+        self.length = len(network.instructions)
+        self.after = array("i", [0]) * len(network.names)
+        self.hits: list[tuple[int, ...]] = []
+        left = network.left
+        right = network.right
+        for start in range(len(network.names)):
+            node = start
+            hits: list[int] = []
+            for step, instruction in enumerate(network.instructions, 1):
+                node = right[node] if instruction else left[node]
+                if targets[node]:
+                    hits.append(step)
+            self.after[start] = node
+            self.hits.append(tuple(hits))
+        self.jumps = [self.after]
+        self.reaches = [bytearray(bool(hits) for hits in self.hits)]
+
+    def _lift(self, level: int) -> None:
+        while len(self.jumps) <= level:
+            jump = self.jumps[-1]
+            reach = self.reaches[-1]
+            self.jumps.append(array("i", (jump[node] for node in jump)))
+            self.reaches.append(
+                bytearray(reach[node] or reach[jump[node]] for node in range(len(jump)))
             )
-            nodes[node.name] = node
-    result = 0
-    current_node = nodes["AAA"]
-    while current_node.name != "ZZZ":
-        for direction in instructions:
-            if direction == "L":
-                next_node = nodes[current_node.left_exit]
-            elif direction == "R":
-                next_node = nodes[current_node.right_exit]
-            else:
-                raise KeyError
-            print(current_node, "->", direction, "->", next_node)
-            current_node = next_node
-            result += 1
-            if current_node.name == "ZZZ":
-                break
-    print("Steps:", result)
+
+    def first_hit(self, node: int) -> int | None:
+        """
+        The number of steps from node until the first target, or None if it
+        never reaches one.
+        """
+        if self.hits[node]:
+            return self.hits[node][0]
+        # Any target is reached within one pass of each node on its cycle
+        levels = len(self.network.names).bit_length() + 1
+        self._lift(levels)
+        passes = 0
+        for level in reversed(range(levels + 1)):
+            if not self.reaches[level][node]:
+                node = self.jumps[level][node]
+                passes += 1 << level
+        if not self.hits[node]:
+            return None
+        return passes * self.length + self.hits[node][0]
+
+    def advance(self, node: int, steps: int) -> int:
+        """
+        The node reached after the given number of steps from node.
+        """
+        passes, rest = divmod(steps, self.length)
+        self._lift(passes.bit_length())
+        level = 0
+        while passes:
+            if passes & 1:
+                node = self.jumps[level][node]
+            passes >>= 1
+            level += 1
+        for instruction in self.network.instructions[:rest]:
+            node = self.network.right[node] if instruction else self.network.left[node]
+        return node
+
+
+def run(path: os.PathLike) -> str:
+    with phase(PARSE):
+        network = Network.parse(read_lines(path))
+    trace = tracing()
+    with phase(SOLVE):
+        targets = bytes(name == "ZZZ" for name in network.names)
+        table = PassTable(network, targets)
+        result = table.first_hit(network.indices["AAA"])
+        if result is None:
+            raise RuntimeError("ZZZ cannot be reached from AAA")
+        if trace:
+            end = table.advance(network.indices["AAA"], result)
+            print("AAA ->", result, "steps ->", network.names[end])
+    info("Steps:", result)
     return str(result)
 
 
@@ -1,76 +1,189 @@
 #!/usr/bin/env python3
 
+import itertools
 import math
 import os
 import re
 import sys
-from dataclasses import dataclass
+from array import array
+from dataclasses import dataclass, field
+from typing import Iterable, Self
 
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
 
-node_pattern = re.compile(r"([0-9A-Z]+) = \(([0-9A-Z]+), ([0-9A-Z]+)\)")
+from aoc.inputs import read_lines
+from aoc.phases import PARSE, SOLVE, phase
+from aoc.verbosity import info, tracing
 
-@dataclass
-class Node:
-    name: str
-    left_exit: str
-    right_exit: str
 
-    def __repr__(self) -> str:
-        return f"Node {self.name} [{self.left_exit} | {self.right_exit}]"
+node_pattern = re.compile(r"([0-9A-Z]+) = \(([0-9A-Z]+), ([0-9A-Z]+)\)")
 
-    @property
-    def is_start(self):
-        return self.name.endswith("A")
 
-    @property
-    def is_end(self):
-        return self.name.endswith("Z")
+@dataclass
+class Network:
+    """
+    The nodes numbered in input order, with the left and right exits of
+    each as node numbers and the instructions as 0 for left, 1 for right.
+    """
 
+    instructions: bytes
+    names: list[str]
+    left: array
+    right: array
+    indices: dict[str, int] = field(default_factory=dict)
 
-def run(path: os.PathLike) -> str:
-    instructions: str | None = None
-    nodes: dict[str, Node] = {}
-    with open(path, "r", encoding="utf-8") as f:
-        for line in f.readlines():
-            line = line.strip()
+    @classmethod
+    def parse(cls, lines: Iterable[str]) -> Self:
+        instructions: str | None = None
+        exits: list[tuple[str, str, str]] = []
+        for line in lines:
             if len(line) == 0:
                 continue
             if instructions is None:
                 instructions = line
                 continue
             matches = node_pattern.match(line)
-            node = Node(
-                matches.group(1),
-                matches.group(2),
-                matches.group(3),
-            )
-            nodes[node.name] = node
-    result = 0
-
-    instances = [n for n in nodes.values() if n.is_start]
-    steps = [0] * len(instances)
-    print(instances)
-    while not all(n.is_end for n in instances):
-        for direction in instructions:
-            next_nodes = []
-            for index, node in enumerate(instances):
-                if node.is_end:
-                    next_nodes.append(node)
-                    continue
-                if direction == "L":
-                    next_nodes.append(nodes[node.left_exit])
-                elif direction == "R":
-                    next_nodes.append(nodes[node.right_exit])
-                else:
-                    raise KeyError
-                steps[index] += 1
-            print(direction, "->", next_nodes)
-            instances = next_nodes
-            if all(n.is_end for n in instances):
+            exits.append((matches.group(1), matches.group(2), matches.group(3)))
+        names = [name for name, _, _ in exits]
+        indices = {name: i for i, name in enumerate(names)}
+        return cls(
+            instructions.translate(str.maketrans("LR", "\x00\x01")).encode("ascii"),
+            names,
+            array("i", (indices[left] for _, left, _ in exits)),
+            array("i", (indices[right] for _, _, right in exits)),
+            indices,
+        )
+
+
+class PassTable:
+    """
+    Where every node ends up after one full pass over the instructions, and
+    the steps into the pass at which it reaches a target node.
+    """
+
+    def __init__(self, network: Network, targets: bytes) -> None:
+        self.length = len(network.instructions)
+        self.after = array("i", [0]) * len(network.names)
+        self.hits: list[tuple[int, ...]] = []
+        left = network.left
+        right = network.right
+        for start in range(len(network.names)):
+            node = start
+            hits: list[int] = []
+            for step, instruction in enumerate(network.instructions, 1):
+                node = right[node] if instruction else left[node]
+                if targets[node]:
+                    hits.append(step)
+            self.after[start] = node
+            self.hits.append(tuple(hits))
+
+
+@dataclass
+class GhostCycle:
+    """
+    A ghost's walk over (node, instruction index) states: after tail steps
+    it repeats every period steps. tail_hits are the steps up to and
+    including tail that land on a Z node, residues the steps after it that
+    do, modulo period.
+    """
+
+    tail: int
+    period: int
+    tail_hits: list[int]
+    residues: list[int]
+
+    def hits(self, step: int) -> bool:
+        if step <= self.tail:
+            return step in self.tail_hits
+        return step % self.period in self.residues
+
+
+def analyse(table: PassTable, node: int) -> GhostCycle:
+    """
+    Finds the cycle by following whole passes, since every pass starts back
+    at the first instruction, and collects the Z hits within each pass.
+    """
+    seen: dict[int, int] = {}
+    order: list[int] = []
+    while node not in seen:
+        seen[node] = len(order)
+        order.append(node)
+        node = table.after[node]
+    start = seen[node]
+    length = table.length
+    tail = start * length
+    period = (len(order) - start) * length
+    tail_hits: list[int] = []
+    residues: list[int] = []
+    for passes, pass_start in enumerate(order):
+        for hit in table.hits[pass_start]:
+            step = passes * length + hit
+            if step <= tail:
+                tail_hits.append(step)
+            else:
+                residues.append(step % period)
+    return GhostCycle(tail, period, tail_hits, sorted(set(residues)))
+
+
+def crt(a: int, m: int, b: int, n: int) -> tuple[int, int] | None:
+    """
+    Combines x = a (mod m) and x = b (mod n) into x = c (mod lcm(m, n)),
+    where m and n need not be coprime. None if there is no such x.
+    """
+    g = math.gcd(m, n)
+    if (b - a) % g:
+        return None
+    k = (b - a) // g * pow(m // g, -1, n // g) % (n // g)
+    modulus = m // g * n
+    return (a + m * k) % modulus, modulus
+
+
+def first_common_hit(cycles: list[GhostCycle]) -> int | None:
+    """
+    The first step at which every ghost is on a Z node. Steps before the
+    longest tail are checked directly, after it every ghost is in its cycle
+    and each choice of one residue per ghost is solved with CRT.
+    """
+    longest = max(cycles, key=lambda c: c.tail)
+    for step in longest.tail_hits:
+        if all(c.hits(step) for c in cycles):
+            return step
+
+    best: int | None = None
+    for choice in itertools.product(*(c.residues for c in cycles)):
+        combined: tuple[int, int] | None = (0, 1)
+        for residue, cycle in zip(choice, cycles):
+            combined = crt(*combined, residue, cycle.period)
+            if combined is None:
                 break
-    print("Steps:", steps)
-    result = math.lcm(*steps)
-    print("Total Steps:", result)
+        if combined is None:
+            continue
+        residue, modulus = combined
+        step = longest.tail + 1 + (residue - longest.tail - 1) % modulus
+        if best is None or step < best:
+            best = step
+    return best
+
+
+def run(path: os.PathLike) -> str:
+    with phase(PARSE):
+        network = Network.parse(read_lines(path))
+    trace = tracing()
+    with phase(SOLVE):
+        targets = bytes(name.endswith("Z") for name in network.names)
+        table = PassTable(network, targets)
+        cycles: list[GhostCycle] = []
+        for node, name in enumerate(network.names):
+            if not name.endswith("A"):
+                continue
+            cycle = analyse(table, node)
+            if trace:
+                print(name, cycle)
+            cycles.append(cycle)
+        result = first_common_hit(cycles)
+        if result is None:
+            raise RuntimeError("The ghosts are never all on Z nodes together")
+    info("Total Steps:", result)
     return str(result)
 
 
@@ -1,31 +1,92 @@
 #!/usr/bin/env python3
 
+import importlib.util
+import math
+import operator
 import os
 import sys
-from itertools import pairwise
+from functools import cache
+from typing import Iterable
 
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
 
-def predict(sequence: list[int]) -> int:
-    difference = [y - x for (x, y) in pairwise(sequence)]
-    if all(x == 0 for x in difference):
-        return sequence[0]
-    prediction = sequence[0] - predict(difference)
-    return prediction
+from aoc.chunks import map_chunks
+from aoc.parsing import extract_ints
+from aoc.phases import SOLVE, phase
+from aoc.verbosity import info, tracing
 
 
-def run(path: os.PathLike) -> str:
-    totals: list[int] = []
-    with open(path, "r", encoding="utf-8") as f:
-        for line in f.readlines():
-            line = line.strip()
-            if not line:
-                continue
-            sequence = [int(x) for x in line.split(" ")]
-            prediction = predict(sequence)
+HAVE_NUMPY = importlib.util.find_spec("numpy") is not None
+
+BACKWARDS = True
+
+
+@cache
+def weights(length: int, backwards: bool = False) -> tuple[int, ...]:
+    """
+    The value after a sequence of length n is the sum of its values weighted
+    by signed binomials, (-1) ** (n - 1 - i) * C(n, i), since that is what
+    taking differences until they vanish and adding them back up amounts
+    to. The value before it is weighted by (-1) ** i * C(n, i + 1).
+    """
+    if backwards:
+        return tuple((-1) ** i * math.comb(length, i + 1) for i in range(length))
+    return tuple((-1) ** (length - 1 - i) * math.comb(length, i) for i in range(length))
+
+
+def predict(sequence: list[int], backwards: bool = False) -> int:
+    return sum(map(operator.mul, weights(len(sequence), backwards), sequence))
+
+
+def extrapolate(
+    sequences: list[list[int]], *, backwards: bool = False, numpy: bool = False
+) -> list[int]:
+    """
+    Predicts every sequence at once, grouping them by length so each group
+    shares one weight vector. With numpy set, a group whose products are
+    sure to fit in an int64 is a single NumPy matrix-vector product.
+    Otherwise, and by default, each row is an exact Python int dot product,
+    the same as calling predict() on it.
+    """
+    groups: dict[int, list[int]] = {}
+    for i, sequence in enumerate(sequences):
+        groups.setdefault(len(sequence), []).append(i)
+    if numpy:
+        try:
+            import numpy as np
+        except ImportError as e:
+            raise ImportError("numpy=True requires NumPy to be installed") from e
+
+    predictions = [0] * len(sequences)
+    for length, members in groups.items():
+        vector = weights(length, backwards)
+        rows = [sequences[i] for i in members]
+        largest = max((abs(x) for row in rows for x in row), default=0)
+        # The weights of a length n sequence add up to 2 ** n in magnitude, so
+        # this also keeps the weights themselves within an int64
+        if numpy and max(largest, 1) << length < 1 << 63:
+            matrix = np.array(rows, dtype=np.int64)
+            results = (matrix @ np.array(vector, dtype=np.int64)).tolist()
+        else:
+            results = [sum(map(operator.mul, vector, row)) for row in rows]
+        for i, result in zip(members, results):
+            predictions[i] = result
+    return predictions
+
+
+def prediction_sum(lines: Iterable[str]) -> int:
+    sequences = [extract_ints(line) for line in lines if line]
+    predictions = extrapolate(sequences, backwards=BACKWARDS, numpy=HAVE_NUMPY)
+    if tracing():
+        for sequence, prediction in zip(sequences, predictions):
             print(prediction, sequence)
-            totals.append(prediction)
-    result = sum(totals)
-    print("Sum of predictions:", result)
+    return sum(predictions)
+
+
+def run(path: os.PathLike) -> str:
+    with phase(SOLVE):
+        result = map_chunks(path, prediction_sum, sum)
+    info("Sum of predictions:", result)
     return str(result)
 
 
@@ -2,30 +2,26 @@
 
 import os
 import sys
-from dataclasses import dataclass
-from enum import Enum
-from math import ceil
-from typing import Callable, Self
+from array import array
+from enum import IntEnum
+from typing import Callable
 
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
 
-class Direction(Enum):
-    NORTH = 1
+from aoc.grid import ORTHOGONAL, Grid
+from aoc.phases import PARSE, RENDER, SOLVE, phase
+from aoc.verbosity import info, tracing
+
+
+class Direction(IntEnum):
+    NORTH = 0
+    EAST = 1
     SOUTH = 2
-    EAST = 3
-    WEST = 4
-
-    @property
-    def inverse(self):
-        if self == Direction.NORTH:
-            return Direction.SOUTH
-        if self == Direction.SOUTH:
-            return Direction.NORTH
-        if self == Direction.EAST:
-            return Direction.WEST
-        if self == Direction.WEST:
-            return Direction.EAST
-        raise KeyError
+    WEST = 3
+
 
+# Indexed by Direction, matching the order of ORTHOGONAL
+INVERSE = (Direction.SOUTH, Direction.WEST, Direction.NORTH, Direction.EAST)
 
 PIPE_EXITS: dict[str, tuple[Direction, Direction]] = {
     "|": (Direction.NORTH, Direction.SOUTH),
@@ -36,90 +32,94 @@ PIPE_EXITS: dict[str, tuple[Direction, Direction]] = {
     "F": (Direction.SOUTH, Direction.EAST),
 }
 
+NO_EXIT = 0xFF
 
-@dataclass
-class Position:
-    x: int
-    y: int
-
-    def moved(self, direction: Direction) -> Self:
-        if direction == Direction.NORTH:
-            return Position(self.x, self.y - 1)
-        if direction == Direction.SOUTH:
-            return Position(self.x, self.y + 1)
-        if direction == Direction.EAST:
-            return Position(self.x + 1, self.y)
-        if direction == Direction.WEST:
-            return Position(self.x - 1, self.y)
-        raise KeyError
-
-    def __hash__(self) -> int:
-        return hash((self.x, self.y))
 
+def build_turns() -> bytes:
+    """
+    A table of where each pipe sends you, at shape * 4 + direction of travel
+    when entering it, or NO_EXIT where the pipe has no opening to come from.
+    """
+    turns = bytearray([NO_EXIT]) * (256 * 4)
+    for shape, (a, b) in PIPE_EXITS.items():
+        turns[ord(shape) * 4 + INVERSE[a]] = b
+        turns[ord(shape) * 4 + INVERSE[b]] = a
+    return bytes(turns)
 
-@dataclass
-class Pipe:
-    position: Position
-    shape: str
-    depth: int = 0
 
-    def can_enter(self, entrance: Direction) -> bool:
-        return entrance in PIPE_EXITS[self.shape]
-
-    def follow(self, entrance: Direction) -> tuple[Direction, Position]:
-        exits = PIPE_EXITS[self.shape]
-        direction = exits[1] if entrance == exits[0] else exits[0]
-        return direction, self.position.moved(direction)
+TURNS = build_turns()
 
 
 class Maze:
-    def __init__(self):
-        self.width: int = 1
-        self.height: int = 1
-        self.pipes: dict[Position, Pipe] = {}
-        self.start: Position | None = None
-
-    def add_tile(self, position: Position, shape: str) -> None:
-        if shape == "S":
-            self.start = position
-            return
-        if shape not in PIPE_EXITS:
-            return
-        self.width = max(self.width, position.x)
-        self.height = max(self.height, position.y)
-        self.pipes[position] = Pipe(position, shape)
-
-    def follow(self, direction: Direction) -> tuple[bool, int]:
-        position = self.start.moved(direction)
-        depth = 0
-        while position in self.pipes:
-            pipe = self.pipes[position]
-            if not pipe.can_enter(direction.inverse):
-                break
-            if pipe.depth != 0:
-                break
-            depth += 1
-            pipe.depth = depth
-            direction, position = pipe.follow(direction.inverse)
-            if position == self.start:
-                return True, depth
-        return False, depth
-
-    def reset(self) -> None:
-        for pipe in self.pipes.values():
-            pipe.depth = 0
-
-    def render(self, func: Callable[[Pipe], str], *, pad: int = 1) -> None:
+    def __init__(self, grid: Grid):
+        # The border of ground lets walks stop at the edge through TURNS alone
+        grid = grid.padded(ord("."))
+        self.grid = grid
+        self.depths = array("i", [0]) * len(grid.data)
+        self.start = grid.data.index(b"S")
+        self.offsets = tuple(dy * grid.width + dx for dx, dy in ORTHOGONAL)
+
+    def start_exits(self) -> list[Direction]:
+        """
+        The directions out of S whose neighbouring pipe connects back to it.
+        """
+        data = self.grid.data
+        exits: list[Direction] = []
+        for direction in Direction:
+            shape = data[self.start + self.offsets[direction]]
+            if TURNS[shape * 4 + direction] != NO_EXIT:
+                exits.append(direction)
+        return exits
+
+    def walk(self, direction: Direction) -> tuple[list[int], Direction] | None:
+        """
+        Follows the pipes out of S in direction. Returns the indices passed,
+        ending with S, and the direction S was entered from, or None when the
+        pipes lead off the grid or into a pipe not open towards them.
+        """
+        data = self.grid.data
+        offsets = self.offsets
+        index = self.start
+        path: list[int] = []
+        while True:
+            index += offsets[direction]
+            path.append(index)
+            if index == self.start:
+                return path, direction
+            direction = TURNS[data[index] * 4 + direction]
+            if direction == NO_EXIT:
+                return None
+
+    def find_loop(self) -> int:
+        """
+        Walks from S out of each candidate exit until one comes back round,
+        which is the first in the usual case, numbering each pipe with its
+        distance along the way, and returns the length of the loop.
+        """
+        for direction in self.start_exits():
+            walked = self.walk(direction)
+            if walked is None:
+                continue
+            path, _ = walked
+            for depth, index in enumerate(path, 1):
+                self.depths[index] = depth
+            return len(path)
+        raise RuntimeError("Could not find loop")
+
+    def render(self, func: Callable[[str, int], str], *, pad: int = 1) -> str:
+        """
+        Draws the maze with func turning each pipe's shape and depth into text.
+        """
         lines: list[str] = []
-        for y in range(1, self.height + 1):
+        for y in range(1, self.grid.height - 1):
             line: list[str] = []
-            for x in range(1, self.width + 1):
-                position = Position(x, y)
-                if position == self.start:
+            for x in range(1, self.grid.width - 1):
+                index = self.grid.index(x, y)
+                shape = chr(self.grid.data[index])
+                if shape in PIPE_EXITS:
+                    line.append(func(shape, self.depths[index]).center(pad))
+                elif shape == "S":
                     line.append("S".center(pad))
-                elif position in self.pipes:
-                    pipe = self.pipes[position]
-                    line.append(func(pipe).center(pad))
                 else:
                     line.append(".".center(pad))
             lines.append("".join(line))
@@ -127,37 +127,28 @@ class Maze:
 
 
 def run(path: os.PathLike) -> str:
-    maze = Maze()
-
-    with open(path, "r", encoding="utf-8") as f:
-        for y, line in enumerate(f.readlines(), 1):
-            line = line.strip()
-            if not line:
-                break
-            for x, c in enumerate(line, 1):
-                maze.add_tile(Position(x, y), c)
-
-    complete: bool = False
-    depth: int = 0
-
-    print("Shape:")
-    print(maze.render(lambda x: x.shape))
-
-    for direction in Direction:
-        print(direction)
-        complete, depth = maze.follow(direction)
-        print(
-            maze.render(lambda x: str(x.depth) if x.depth else ".", pad=len(str(depth)))
-        )
-        if complete:
-            break
-        maze.reset()
-
-    if not complete:
-        raise RuntimeError("Could not find loop")
-
-    result = ceil(float(depth) / 2.0)
-    print("Max Depth:", result)
+    with phase(PARSE):
+        maze = Maze(Grid.read(path))
+
+    trace = tracing()
+    if trace:
+        with phase(RENDER):
+            print("Shape:")
+            print(maze.render(lambda shape, depth: shape))
+
+    with phase(SOLVE):
+        length = maze.find_loop()
+        result = length // 2
+
+    if trace:
+        with phase(RENDER):
+            print(
+                maze.render(
+                    lambda shape, depth: str(depth) if depth else ".",
+                    pad=len(str(length)),
+                )
+            )
+    info("Max Depth:", result)
 
     return str(result)
 
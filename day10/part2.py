@@ -2,29 +2,25 @@
 
 import os
 import sys
-from dataclasses import dataclass
-from enum import Enum
-from typing import Self
+from enum import IntEnum
+from typing import Iterator
 
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
 
-class Direction(Enum):
-    NORTH = 1
+from aoc.grid import ORTHOGONAL, Grid
+from aoc.phases import PARSE, RENDER, SOLVE, phase
+from aoc.verbosity import info, tracing
+
+
+class Direction(IntEnum):
+    NORTH = 0
+    EAST = 1
     SOUTH = 2
-    EAST = 3
-    WEST = 4
-
-    @property
-    def inverse(self):
-        if self == Direction.NORTH:
-            return Direction.SOUTH
-        if self == Direction.SOUTH:
-            return Direction.NORTH
-        if self == Direction.EAST:
-            return Direction.WEST
-        if self == Direction.WEST:
-            return Direction.EAST
-        raise KeyError
+    WEST = 3
+
 
+# Indexed by Direction, matching the order of ORTHOGONAL
+INVERSE = (Direction.SOUTH, Direction.WEST, Direction.NORTH, Direction.EAST)
 
 PIPE_EXITS: dict[str, tuple[Direction, Direction]] = {
     "|": (Direction.NORTH, Direction.SOUTH),
@@ -35,137 +31,146 @@ PIPE_EXITS: dict[str, tuple[Direction, Direction]] = {
     "F": (Direction.SOUTH, Direction.EAST),
 }
 
-
-@dataclass
-class Position:
-    x: int
-    y: int
-
-    def moved(self, direction: Direction) -> Self:
-        if direction == Direction.NORTH:
-            return Position(self.x, self.y - 1)
-        if direction == Direction.SOUTH:
-            return Position(self.x, self.y + 1)
-        if direction == Direction.EAST:
-            return Position(self.x + 1, self.y)
-        if direction == Direction.WEST:
-            return Position(self.x - 1, self.y)
-        raise KeyError
-
-    def __hash__(self) -> int:
-        return hash((self.x, self.y))
+NO_EXIT = 0xFF
 
 
-@dataclass
-class Pipe:
-    position: Position
-    shape: str
-    is_loop: bool = False
+def build_turns() -> bytes:
+    """
+    A table of where each pipe sends you, at shape * 4 + direction of travel
+    when entering it, or NO_EXIT where the pipe has no opening to come from.
+    """
+    turns = bytearray([NO_EXIT]) * (256 * 4)
+    for shape, (a, b) in PIPE_EXITS.items():
+        turns[ord(shape) * 4 + INVERSE[a]] = b
+        turns[ord(shape) * 4 + INVERSE[b]] = a
+    return bytes(turns)
 
-    def can_enter(self, entrance: Direction) -> bool:
-        return entrance in PIPE_EXITS[self.shape]
 
-    def follow(self, entrance: Direction) -> tuple[Direction, Position]:
-        exits = PIPE_EXITS[self.shape]
-        direction = exits[1] if entrance == exits[0] else exits[0]
-        return direction, self.position.moved(direction)
+TURNS = build_turns()
+NORTH_SHAPES = bytes(ord(s) for s, exits in PIPE_EXITS.items() if Direction.NORTH in exits)
 
 
 class Maze:
-    def __init__(self):
-        self.width: int = 1
-        self.height: int = 1
-        self.pipes: dict[Position, Pipe] = {}
-        self.start: Position | None = None
-
-    def add_tile(self, position: Position, shape: str) -> None:
-        if shape == "S":
-            self.start = position
-            return
-        if shape not in PIPE_EXITS:
-            return
-        self.width = max(self.width, position.x)
-        self.height = max(self.height, position.y)
-        self.pipes[position] = Pipe(position, shape)
+    def __init__(self, grid: Grid):
+        # The border of ground lets walks stop at the edge through TURNS alone
+        grid = grid.padded(ord("."))
+        self.grid = grid
+        self.loop = bytearray(len(grid.data))
+        self.start = grid.data.index(b"S")
+        self.offsets = tuple(dy * grid.width + dx for dx, dy in ORTHOGONAL)
+
+    def start_exits(self) -> list[Direction]:
+        """
+        The directions out of S whose neighbouring pipe connects back to it.
+        """
+        data = self.grid.data
+        exits: list[Direction] = []
+        for direction in Direction:
+            shape = data[self.start + self.offsets[direction]]
+            if TURNS[shape * 4 + direction] != NO_EXIT:
+                exits.append(direction)
+        return exits
+
+    def walk(self, direction: Direction) -> tuple[list[int], Direction] | None:
+        """
+        Follows the pipes out of S in direction. Returns the indices passed,
+        ending with S, and the direction S was entered from, or None when the
+        pipes lead off the grid or into a pipe not open towards them.
+        """
+        data = self.grid.data
+        offsets = self.offsets
+        index = self.start
+        path: list[int] = []
+        while True:
+            index += offsets[direction]
+            path.append(index)
+            if index == self.start:
+                return path, direction
+            direction = TURNS[data[index] * 4 + direction]
+            if direction == NO_EXIT:
+                return None
 
     def find_loop(self) -> None:
-        for start_direction in Direction:
-            direction = start_direction
-            position = self.start.moved(direction)
-            while position in self.pipes:
-                pipe = self.pipes[position]
-                if not pipe.can_enter(direction.inverse):
-                    break
-                if pipe.is_loop:
-                    break
-                pipe.is_loop = True
-                direction, position = pipe.follow(direction.inverse)
-                if position == self.start:
-                    for position, pipe in [*self.pipes.items()]:
-                        if pipe.is_loop:
-                            continue
-                        del self.pipes[position]
-                    for shape, exits in PIPE_EXITS.items():
-                        if direction.inverse in exits and start_direction in exits:
-                            self.pipes[self.start] = Pipe(self.start, shape, True)
-                            break
-                    return
-            for pipe in self.pipes.values():
-                pipe.is_loop = False
+        """
+        Walks from S out of each candidate exit until one comes back round,
+        which is the first in the usual case, marking each pipe on it. S is
+        replaced by the pipe shape joining the two exits that close the loop.
+        """
+        for direction in self.start_exits():
+            walked = self.walk(direction)
+            if walked is None:
+                continue
+            path, arrival = walked
+            for index in path:
+                self.loop[index] = 1
+            exits = {direction, INVERSE[arrival]}
+            for shape, shape_exits in PIPE_EXITS.items():
+                if set(shape_exits) == exits:
+                    self.grid[self.grid.position(self.start)] = ord(shape)
+            return
         raise RuntimeError("Could not find loop")
 
-    def is_inside(self, position: Position) -> bool:
-        vertical = 0
-        for x in range(1, position.x):
-            sample = Position(x, position.y)
-            if sample not in self.pipes:
-                continue
-            exits = PIPE_EXITS[self.pipes[sample].shape]
-            if Direction.NORTH in exits:
-                vertical += 1
-        if (vertical % 2) == 1:
-            return True
-
-        horizontal = 0
-        for y in range(1, position.y):
-            sample = Position(position.x, y)
-            if sample not in self.pipes:
-                continue
-            exits = PIPE_EXITS[self.pipes[sample].shape]
-            if Direction.EAST in exits:
-                horizontal += 1
-        return (horizontal % 2) == 1
+    def inside_spans(self) -> Iterator[tuple[int, int]]:
+        """
+        Yields the index ranges of each row that lie inside the loop, scanning
+        the row once and flipping a parity flag on every loop pipe that leads
+        north. A run of loop pipes along the row flips it only if it enters
+        and leaves on opposite sides, which is exactly when one end leads
+        north. Only loop tiles are visited, the gaps are skipped with find.
+        """
+        data = self.grid.data
+        loop = self.loop
+        width = self.grid.width
+        for row_start in range(0, len(data), width):
+            row_end = row_start + width
+            span_start = -1
+            index = loop.find(1, row_start, row_end)
+            while index != -1:
+                if data[index] in NORTH_SHAPES:
+                    if span_start == -1:
+                        span_start = index + 1
+                    else:
+                        yield span_start, index
+                        span_start = -1
+                index = loop.find(1, index + 1, row_end)
+
+    def count_enclosed(self) -> int:
+        return sum(
+            end - start - self.loop.count(1, start, end)
+            for start, end in self.inside_spans()
+        )
+
+    def enclosed(self) -> Iterator[int]:
+        for start, end in self.inside_spans():
+            for index in range(start, end):
+                if not self.loop[index]:
+                    yield index
 
 
 def run(path: os.PathLike) -> str:
-    maze = Maze()
-
-    with open(path, "r", encoding="utf-8") as f:
-        for y, line in enumerate(f.readlines(), 1):
-            line = line.strip()
-            if not line:
-                break
-            for x, c in enumerate(line, 1):
-                maze.add_tile(Position(x, y), c)
-
-    maze.find_loop()
-
-    result = 0
-
-    for y in range(1, maze.height + 1):
-        line: list[str] = []
-        for x in range(1, maze.width + 1):
-            position = Position(x, y)
-            if position in maze.pipes:
-                line.append(maze.pipes[position].shape)
-            elif maze.is_inside(position):
-                result += 1
-                line.append("#")
-            else:
-                line.append(" ")
-        print("".join(line))
-
-    print("Total Enclosed Tiles:", result)
+    with phase(PARSE):
+        maze = Maze(Grid.read(path))
+
+    with phase(SOLVE):
+        maze.find_loop()
+        result = maze.count_enclosed()
+
+    if tracing():
+        with phase(RENDER):
+            enclosed = set(maze.enclosed())
+            for y in range(1, maze.grid.height - 1):
+                line: list[str] = []
+                for x in range(1, maze.grid.width - 1):
+                    index = maze.grid.index(x, y)
+                    if maze.loop[index]:
+                        line.append(chr(maze.grid.data[index]))
+                    elif index in enclosed:
+                        line.append("#")
+                    else:
+                        line.append(" ")
+                print("".join(line))
+
+    info("Total Enclosed Tiles:", result)
     return str(result)
 
 
@@ -2,65 +2,41 @@
 
 import os
 import sys
-from dataclasses import dataclass
 
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
 
-EXPANSION = 1000000
+from aoc.galaxies import DistanceTerms, Position, count_galaxies, expanded_offsets
+from aoc.grid import Grid
+from aoc.phases import PARSE, RENDER, SOLVE, phase
+from aoc.verbosity import info, tracing
 
 
-@dataclass
-class Position:
-    x: int
-    y: int
+EXPANSION = 1000000
 
 
 def run(path: os.PathLike) -> str:
-    width = 0
-    height = 0
-    galaxies: list[Position] = []
-    occupied_rows: list[int] = []
-    occupied_columns: list[int] = []
-
-    with open(path, "r", encoding="utf-8") as f:
-        for y, line in enumerate(f.readlines()):
-            line = line.strip()
-            if not line:
-                break
-            height += 1
-            width = len(line)
-            for x, c in enumerate(line):
-                if c != "#":
-                    continue
-                if x not in occupied_columns:
-                    occupied_columns.append(x)
-                if y not in occupied_rows:
-                    occupied_rows.append(y)
-                galaxies.append(Position(x, y))
-
-    empty_columns = [x for x in range(width) if x not in occupied_columns]
-    empty_rows = [x for x in range(height) if x not in occupied_rows]
-
-    for i, x in enumerate(empty_columns):
-        for galaxy in galaxies:
-            if galaxy.x < x + i * (EXPANSION - 1):
-                continue
-            galaxy.x += EXPANSION - 1
-
-    for i, y in enumerate(empty_rows):
-        for galaxy in galaxies:
-            if galaxy.y < y + i * (EXPANSION - 1):
-                continue
-            galaxy.y += EXPANSION - 1
-
-    distances: list[int] = []
-    for i, a in enumerate(galaxies):
-        for j, b in enumerate(galaxies[i + 1 :], i + 1):
-            distance = abs(a.x - b.x) + abs(a.y - b.y)
-            distances.append(distance)
-            print(f"{i + 1} & {j + 1}: {distance}")
-
-    result = sum(distances)
-    print("Total Distances:", result)
+    with phase(PARSE):
+        grid = Grid.read(path)
+        column_counts, row_counts, galaxies = count_galaxies(grid)
+
+    with phase(SOLVE):
+        result = DistanceTerms.from_counts(column_counts, row_counts).total(EXPANSION)
+
+    trace = tracing()
+    if trace:
+        with phase(RENDER):
+            column_offsets = expanded_offsets(column_counts, EXPANSION)
+            row_offsets = expanded_offsets(row_counts, EXPANSION)
+            expanded = [
+                Position(column_offsets[galaxy.x], row_offsets[galaxy.y])
+                for galaxy in galaxies
+            ]
+            for i, a in enumerate(expanded):
+                for j, b in enumerate(expanded[i + 1 :], i + 1):
+                    distance = abs(a.x - b.x) + abs(a.y - b.y)
+                    print(f"{i + 1} & {j + 1}: {distance}")
+
+    info("Total Distances:", result)
     return str(result)
 
 
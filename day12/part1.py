@@ -1,60 +1,81 @@
 #!/usr/bin/env python3
 
-import itertools
 import os
 import sys
+from typing import Iterable
 
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
 
-def is_possible_layout(records: str, groupings: list[int], offsets: list[int]) -> bool:
-    for size, offset, next_offset in zip(groupings[:-1], offsets[:-1], offsets[1:]):
-        if size + offset >= next_offset:
-            return False
-    for position, c in enumerate(records):
-        if c == "?":
-            continue
-        is_group = False
-        for size, offset in zip(groupings, offsets):
-            if offset <= position < offset + size:
-                is_group = True
-                break
-        if (c == "#") != is_group:
-            return False
-    return True
+from aoc.chunks import map_chunks
+from aoc.phases import SOLVE, phase
+from aoc.verbosity import info, tracing
 
 
-def run(path: os.PathLike) -> str:
-    total_arrangements = 0
-    with open(path, "r", encoding="utf-8") as f:
-        for line in f.readlines():
-            line = line.strip()
-            if not line:
+UNFOLD = 1
+
+
+def unfold(records: str, groupings: list[int], factor: int) -> tuple[str, list[int]]:
+    return "?".join([records] * factor), groupings * factor
+
+
+def count_arrangements(records: str, groupings: list[int]) -> int:
+    """
+    Counts the layouts by how many ways the rest of the record, from index i,
+    can hold the groups from index g on. There are only
+    len(records) * len(groupings) such states, and the table is filled from
+    the end of the record backwards so each is solved once from states that
+    are already known, without recursing.
+    """
+    length = len(records)
+    groups = len(groupings)
+    # The record must still have room for the remaining groups and their gaps
+    needed = [0] * (groups + 1)
+    for g in range(groups - 1, -1, -1):
+        needed[g] = needed[g + 1] + groupings[g] + 1
+
+    # A group ending the record skips the gap after it, landing on length + 1
+    ways = [[0] * (groups + 1) for _ in range(length + 2)]
+    ways[length][groups] = 1
+    ways[length + 1][groups] = 1
+    for i in range(length - 1, -1, -1):
+        row = ways[i]
+        if records[i] != "#":
+            row[groups] = ways[i + 1][groups]
+        for g in range(groups):
+            if length - i < needed[g] - 1:
                 continue
-            records, groupings = line.split(" ", 1)
-            groupings = [int(x) for x in groupings.split(",")]
-
-            group_positions: list[list[int]] = []
-            for i, size in enumerate(groupings):
-                positions: list[int] = []
-                start = sum(groupings[:i]) + i
-                end = len(records) - sum(groupings[i:]) - len(groupings) + i + 1
-                for offset in range(start, end + 1):
-                    if offset > 0 and records[offset - 1] == "#":
-                        continue
-                    if offset + size < len(records) and records[offset + size] == "#":
-                        continue
-                    if "." in records[offset:offset+ size]:
-                        continue
-                    positions.append(offset)
-                group_positions.append(positions)
-
-            record_arrangements = 0
-            for offsets in itertools.product(*group_positions):
-                if is_possible_layout(records, groupings, offsets):
-                    record_arrangements += 1
-            total_arrangements += record_arrangements
+            arrangements = 0
+            if records[i] != "#":
+                arrangements += ways[i + 1][g]
+            if records[i] != ".":
+                end = i + groupings[g]
+                if "." not in records[i:end] and (end == length or records[end] != "#"):
+                    arrangements += ways[end + 1][g + 1]
+            row[g] = arrangements
+    return ways[0][0]
+
+
+def arrangements_sum(lines: Iterable[str]) -> int:
+    trace = tracing()
+    total_arrangements = 0
+    for line in lines:
+        if not line:
+            continue
+        records, groupings = line.split(" ", 1)
+        groupings = [int(x) for x in groupings.split(",")]
+        records, groupings = unfold(records, groupings, UNFOLD)
+
+        record_arrangements = count_arrangements(records, groupings)
+        total_arrangements += record_arrangements
+        if trace:
             print(records, groupings, "->", record_arrangements)
+    return total_arrangements
+
 
-    print("Total arrangements:", total_arrangements)
+def run(path: os.PathLike) -> str:
+    with phase(SOLVE):
+        total_arrangements = map_chunks(path, arrangements_sum, sum)
+    info("Total arrangements:", total_arrangements)
     return str(total_arrangements)
 
 
@@ -2,81 +2,74 @@
 
 import os
 import sys
+from typing import Iterable
 
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
 
-def compare_lists(top: list[str], bottom: list[str], *, smudged: bool = False):
-    has_smudge = False
-    for a, b in zip(top, bottom):
-        for x, y in zip(a, b):
-            if x == y:
-                continue
-            if not smudged:
-                return False
-            if has_smudge:
-                return False
-            has_smudge = True
-    if smudged and not has_smudge:
-        return False
-    return True
-
-
-def find_mirror(shape: list[list[str]]) -> int:
-    height = len(shape)
-    width = len(shape[0])
-
-    middle = height // 2 + 1
-    for i in range(1, middle):
-        top = shape[:i]
-        bottom = [*reversed(shape[i : i + i])]
-        if compare_lists(top, bottom, smudged=True):
-            return i * 100
-        j = height - i
-        top = shape[j:]
-        bottom = [*reversed(shape[j - i : j])]
-        if compare_lists(top, bottom, smudged=True):
-            return j * 100
-
-    transposed = []
-    for x in range(width):
-        transposed_row = []
-        for row in shape:
-            transposed_row.append(row[x])
-        transposed.append("".join(transposed_row))
-
-    middle = width // 2 + 1
-    for i in range(1, middle):
-        top = transposed[:i]
-        bottom = [*reversed(transposed[i : i + i])]
-        if compare_lists(top, bottom, smudged=True):
-            return i
-        j = width - i
-        top = transposed[j:]
-        bottom = [*reversed(transposed[j - i : j])]
-        if compare_lists(top, bottom, smudged=True):
-            return j
+from aoc.grid import Grid
+from aoc.inputs import read_blocks
+from aoc.phases import SOLVE, phase
+from aoc.verbosity import info, tracing
+
+
+SMUDGES = 1
+
+BITS = bytes.maketrans(b"#.", b"10")
+
+
+def encode(lines: Iterable[bytes]) -> list[int]:
+    """
+    Packs each line into an int with a set bit per rock, so lines compare
+    as ints and the cells two lines differ in are the bits of a ^ b.
+    """
+    return [int(line.translate(BITS), 2) for line in lines]
+
+
+def find_axis(masks: list[int], max_smudges: int) -> int | None:
+    """
+    Finds the axis, counted in lines before it, whose two sides mirror each
+    other once exactly max_smudges cells are flipped.
+    """
+    for axis in range(1, len(masks)):
+        smudges = 0
+        for i in range(min(axis, len(masks) - axis)):
+            smudges += (masks[axis - 1 - i] ^ masks[axis + i]).bit_count()
+            if smudges > max_smudges:
+                break
+        else:
+            if smudges == max_smudges:
+                return axis
+    return None
+
+
+def find_mirror(grid: Grid, max_smudges: int = 0) -> int:
+    rows = encode(grid.row_bytes(y) for y in range(grid.height))
+    axis = find_axis(rows, max_smudges)
+    if axis is not None:
+        return axis * 100
+
+    transposed = grid.transpose()
+    columns = encode(transposed.row_bytes(x) for x in range(grid.width))
+    axis = find_axis(columns, max_smudges)
+    if axis is not None:
+        return axis
 
     raise RuntimeError("No mirror found")
 
 
 def run(path: os.PathLike) -> str:
-    shapes: list[list[str]] = [[]]
-    with open(path, "r", encoding="utf-8") as f:
-        for line in f.readlines():
-            line = line.strip()
-            if not line:
-                shapes.append([])
-                continue
-            shapes[-1].append(line)
-    result = 0
-    shapes = filter(None, shapes)
-    for shape in shapes:
-        print("\n".join(shape))
-        if not shape:
-            continue
-        mirror = find_mirror(shape)
-        print("Mirror point:", mirror)
-        result += mirror
-    print("Total:", result)
+    trace = tracing()
+    with phase(SOLVE):
+        result = 0
+        for shape in read_blocks(path):
+            grid = Grid.from_lines(shape)
+            if trace:
+                print(grid)
+            mirror = find_mirror(grid, SMUDGES)
+            if trace:
+                print("Mirror point:", mirror)
+            result += mirror
+    info("Total:", result)
     return str(result)
 
 
@@ -3,39 +3,64 @@
 import os
 import sys
 
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+
+from aoc.grid import Grid
+from aoc.phases import PARSE, RENDER, SOLVE, phase
+from aoc.verbosity import info, tracing
+
+
+NORTH = "north"
+WEST = "west"
+SOUTH = "south"
+EAST = "east"
+
+ROCK = b"O"
+
+
+def roll(line: bytes, *, forwards: bool) -> bytes:
+    """
+    Rolls the round rocks in every run between cube rocks to the start of
+    the line, or to its end when forwards is set.
+    """
+    spaces: list[bytes] = []
+    for space in line.split(b"#"):
+        rocks = space.count(ROCK)
+        if forwards:
+            spaces.append(b"." * (len(space) - rocks) + ROCK * rocks)
+        else:
+            spaces.append(ROCK * rocks + b"." * (len(space) - rocks))
+    return b"#".join(spaces)
+
+
+def tilt(grid: Grid, direction: str) -> None:
+    if direction in (NORTH, SOUTH):
+        for x in range(grid.width):
+            grid.set_column(x, roll(grid.column(x), forwards=direction == SOUTH))
+    else:
+        for y in range(grid.height):
+            grid.set_row(y, roll(grid.row_bytes(y), forwards=direction == EAST))
+
+
+def north_load(grid: Grid) -> int:
+    return sum(
+        grid.row_bytes(y).count(ROCK) * (grid.height - y) for y in range(grid.height)
+    )
+
 
 def run(path: os.PathLike) -> str:
-    shape: list[str] = []
-
-    with open(path, "r", encoding="utf-8") as f:
-        for line in f.readlines():
-            line = line.strip()
-            if not line:
-                break
-            shape.append(line)
-
-    transposed = []
-    for x in range(len(shape[0])):
-        transposed_row = []
-        for row in shape:
-            transposed_row.append(row[x])
-        transposed.append("".join(transposed_row))
-
-    total_load = 0
-    for column in transposed:
-        shifted = []
-        load = 0
-        load_start = len(column)
-        for space in column.split("#"):
-            rocks = space.count("O")
-            shifted.append(("O" * rocks).ljust(len(space), "."))
-            # We use gaussian sum here
-            load += int(rocks * (load_start * 2 - rocks + 1) / 2)
-            load_start -= len(space) + 1
-        total_load += load
-        print("#".join(shifted), load)
-
-    print("Total load:", total_load)
+    with phase(PARSE):
+        grid = Grid.read(path)
+
+    with phase(SOLVE):
+        tilt(grid, NORTH)
+        total_load = north_load(grid)
+
+    if tracing():
+        with phase(RENDER):
+            print(grid)
+
+    info("Total load:", total_load)
     return str(total_load)
 
 
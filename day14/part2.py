@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+
+import hashlib
+import os
+import sys
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+
+from aoc.grid import Grid
+from aoc.phases import PARSE, SOLVE, phase
+from aoc.verbosity import info, tracing
+
+
+NORTH = "north"
+WEST = "west"
+SOUTH = "south"
+EAST = "east"
+SPIN_CYCLE = (NORTH, WEST, SOUTH, EAST)
+CYCLES = 1000000000
+
+ROCK = b"O"
+
+
+def roll(line: bytes, *, forwards: bool) -> bytes:
+    """
+    Rolls the round rocks in every run between cube rocks to the start of
+    the line, or to its end when forwards is set.
+    """
+    spaces: list[bytes] = []
+    for space in line.split(b"#"):
+        rocks = space.count(ROCK)
+        if forwards:
+            spaces.append(b"." * (len(space) - rocks) + ROCK * rocks)
+        else:
+            spaces.append(ROCK * rocks + b"." * (len(space) - rocks))
+    return b"#".join(spaces)
+
+
+def tilt(grid: Grid, direction: str) -> None:
+    if direction in (NORTH, SOUTH):
+        for x in range(grid.width):
+            grid.set_column(x, roll(grid.column(x), forwards=direction == SOUTH))
+    else:
+        for y in range(grid.height):
+            grid.set_row(y, roll(grid.row_bytes(y), forwards=direction == EAST))
+
+
+def north_load(grid: Grid) -> int:
+    return sum(
+        grid.row_bytes(y).count(ROCK) * (grid.height - y) for y in range(grid.height)
+    )
+
+
+def fingerprint(grid: Grid) -> bytes:
+    """
+    A 16 byte digest of the grid, so remembering a state costs the same
+    however large the platform is.
+    """
+    return hashlib.blake2b(grid.data, digest_size=16).digest()
+
+
+def spin_load(grid: Grid, cycles: int) -> int:
+    """
+    Runs spin cycles until the platform returns to a state it was in before,
+    then reads the load after the requested number of cycles off the loop.
+    Only the fingerprint and load of each state seen are kept.
+    """
+    trace = tracing()
+    seen: dict[bytes, int] = {}
+    loads: list[int] = []
+    for i in range(cycles + 1):
+        state = fingerprint(grid)
+        if state in seen:
+            start = seen[state]
+            period = i - start
+            if trace:
+                print(f"Cycle {i} repeats cycle {start}, period {period}")
+            return loads[start + (cycles - start) % period]
+        seen[state] = i
+        loads.append(north_load(grid))
+        if trace:
+            print(f"Cycle {i}: load {loads[-1]}")
+        for direction in SPIN_CYCLE:
+            tilt(grid, direction)
+    return loads[cycles]
+
+
+def run(path: os.PathLike) -> str:
+    with phase(PARSE):
+        grid = Grid.read(path)
+
+    with phase(SOLVE):
+        total_load = spin_load(grid, CYCLES)
+
+    info("Total load:", total_load)
+    return str(total_load)
+
+
+if __name__ == "__main__":
+    filename = os.path.join(os.path.dirname(__file__), "input.txt")
+    if len(sys.argv) > 1:
+        filename = sys.argv[-1]
+    run(filename)
@@ -3,21 +3,28 @@
 import os
 import sys
 
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+
+from aoc.inputs import read_tokens
+from aoc.phases import SOLVE, phase
+from aoc.verbosity import info, tracing
+
 
 def run(path: os.PathLike) -> str:
-    with open(path, "r", encoding="ascii") as f:
-        line = f.readline().strip()
-    total = 0
-    sequences = line.split(",")
-    for sequence in sequences:
-        value = 0
-        for c in sequence:
-            value += ord(c)
-            value *= 17
-            value %= 256
-        total += value
-        print(sequence, value)
-    print("Total:", total)
+    trace = tracing()
+    with phase(SOLVE):
+        total = 0
+        for sequence in read_tokens(path, b","):
+            sequence = sequence.strip()
+            value = 0
+            for c in sequence:
+                value += c
+                value *= 17
+                value %= 256
+            total += value
+            if trace:
+                print(sequence.decode("ascii"), value)
+    info("Total:", total)
     return str(total)
 
 
@@ -3,40 +3,105 @@
 import os
 import re
 import sys
-from collections import OrderedDict
+from array import array
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Iterator
 
-label_pattern = re.compile("([a-zA-Z]+)(-|=([1-9]))")
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
 
+from aoc.inputs import read_tokens
+from aoc.phases import SOLVE, phase
+from aoc.verbosity import info
+
+label_pattern = re.compile(rb"([a-zA-Z]+)(-|=([1-9]))")
+
+
+BOXES = 256
+# Labels hashed recently, bounded so that a stream of distinct labels cannot
+# grow the cache without limit
+LABEL_CACHE_SIZE = 4096
+
+
+@lru_cache(maxsize=LABEL_CACHE_SIZE)
+def box_of(label: bytes) -> int:
+    box_id = 0
+    for c in label:
+        box_id += c
+        box_id *= 17
+        box_id %= 256
+    return box_id
+
+
+@dataclass
+class Box:
+    labels: list[bytes] = field(default_factory=list)
+    focal_lengths: array = field(default_factory=lambda: array("B"))
 
-def run(path: os.PathLike) -> str:
-    with open(path, "r", encoding="ascii") as f:
-        line = f.readline().strip()
 
-    boxes: dict[int, OrderedDict[str, int]] = {}
+class LensBoxes:
+    """
+    The 256 boxes, each keeping its lenses' labels and focal lengths in slot
+    order. power is kept up to date by every operation, so the focusing power
+    after any prefix of the steps is available without recomputing it.
+    """
 
-    sequences = line.split(",")
-    for sequence in sequences:
-        matches = label_pattern.match(sequence)
-        label = matches.group(1)
+    def __init__(self) -> None:
+        self.boxes = [Box() for _ in range(BOXES)]
+        self.power = 0
+
+    def insert(self, label: bytes, focal_length: int) -> None:
+        box_id = box_of(label)
+        box = self.boxes[box_id]
+        try:
+            slot = box.labels.index(label)
+        except ValueError:
+            box.labels.append(label)
+            box.focal_lengths.append(focal_length)
+            self.power += (box_id + 1) * len(box.labels) * focal_length
+            return
+        change = focal_length - box.focal_lengths[slot]
+        self.power += (box_id + 1) * (slot + 1) * change
+        box.focal_lengths[slot] = focal_length
+
+    def remove(self, label: bytes) -> None:
+        box_id = box_of(label)
+        box = self.boxes[box_id]
+        try:
+            slot = box.labels.index(label)
+        except ValueError:
+            return
+        # Every lens behind the removed one moves forward a slot
+        shifted = sum(box.focal_lengths[slot + 1 :])
+        self.power -= (box_id + 1) * ((slot + 1) * box.focal_lengths[slot] + shifted)
+        del box.labels[slot]
+        del box.focal_lengths[slot]
+
+    def apply(self, step: bytes) -> None:
+        matches = label_pattern.match(step.strip())
         focal_length = matches.group(3)
-        box_id = 0
-        for c in label:
-            box_id += ord(c)
-            box_id *= 17
-            box_id %= 256
         if focal_length is not None:
-            if box_id not in boxes:
-                boxes[box_id] = OrderedDict()
-            boxes[box_id][label] = int(focal_length)
-        elif box_id in boxes and label in boxes[box_id]:
-            del boxes[box_id][label]
-
-    total = 0
-    for box_id, lenses in boxes.items():
-        for slot, focal_length in enumerate(lenses.values(), 1):
-            power = (box_id + 1) * slot * focal_length
-            total += power
-    print("Total:", total)
+            self.insert(matches.group(1), int(focal_length))
+        else:
+            self.remove(matches.group(1))
+
+
+def replay(path: os.PathLike) -> Iterator[int]:
+    """
+    Yields the focusing power after each step of the sequence.
+    """
+    boxes = LensBoxes()
+    for step in read_tokens(path, b","):
+        boxes.apply(step)
+        yield boxes.power
+
+
+def run(path: os.PathLike) -> str:
+    with phase(SOLVE):
+        total = 0
+        for total in replay(path):
+            pass
+    info("Total:", total)
     return str(total)
 
 